@@ -1,34 +1,31 @@
 import streamlit as st
 import pandas as pd
-from sqlalchemy.orm import sessionmaker
-from models import engine, Resume
+import numpy as np
+from models import Session, init_db
 from resume_parser import parser
-import os
-import spacy
 import logging
-import joblib
+from config import SKILL_MATCH_WEIGHT, EXPERIENCE_WEIGHT, ML_MODEL_WEIGHT, RANKING_SHORTLIST_SIZE, SEMANTIC_WEIGHT
+from config import METRICS_PATH, METRICS_PORT, INGEST_USE_QUEUE, UI_POLL_SECONDS
+import metrics
+import model_registry
+from metrics import TRACE, span
+from nlp_cache import doc_cache
+from ingest import ingest_resume, ingest_batch
+from ranking import combine_scores
+from score_store import load_features, ensure_features, ranked_count, ranked_page, iter_ranked
+from candidate_pool import new_pool_id, add_to_pool, pool_filter, pool_size
+from semantic import semantic_backend, semantic_shortlist
+from skill_index import shortlist_filter
+from jd_profile import get_job_profile
+from parse_cache import file_hash
+from job_queue import enqueue, batch_status, QUEUED, RUNNING, DONE
+import os
 import tempfile
-from config import SKILL_MATCH_WEIGHT, EXPERIENCE_WEIGHT, ML_MODEL_WEIGHT, MODEL_PATH
-import re  # Import the regular expression module
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Load spaCy's English model
-nlp = spacy.load("en_core_web_sm")
-
-# Database connection setup
-Session = sessionmaker(bind=engine)
-
-# Load the trained machine learning model
-try:
-    model = joblib.load(MODEL_PATH)
-    logging.info("Machine learning model loaded successfully.")
-except Exception as e:
-    logging.error(f"Error loading machine learning model: {e}")
-    model = None
-
-
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'docx', 'pdf', 'txt'}
 
@@ -37,149 +34,142 @@ def process_resume(file_content, filename, file_type):
     """Extracts info, stores to database, and handles errors."""
     try:
         with Session() as session:
-            if file_type == "docx":
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                    tmp.write(file_content)
-                    tmp_path = tmp.name
-                try:
-                    text = parser.extract_text_from_docx(tmp_path)
-                finally:
-                    os.remove(tmp_path)  # Ensure cleanup
-
-            elif file_type == "pdf":
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                    tmp.write(file_content)
-                    tmp_path = tmp.name
-                try:
-                    text = parser.extract_text_from_pdf(tmp_path)
-                finally:
-                    os.remove(tmp_path)
-
-            elif file_type == "txt":
-                text = file_content.decode("utf-8")
-            else:
-                return [], 0  # Unsupported file type
-
-            if text:
-                skills = parser.extract_skills_nlp(text)
-                experience = parser.extract_experience_nlp(text)
-                resume = Resume(filename=filename, text_content=text, skills=','.join(skills), experience=experience)
-                session.add(resume)
-                session.commit()
-                return skills, experience
-            else:
-                return [], 0  # No text extracted
-
+            return ingest_resume(session, file_content, filename, file_type)
     except Exception as e:
         st.error(f"Error processing resume '{filename}': {e}")
         logging.exception(f"Error processing resume '{filename}': {e}")  # Log the full traceback
         return [], 0  # Consistent return on error
 
 
-def extract_features(resume, job_keywords):
-    """Extracts features for the machine learning model."""
-    resume_skills = resume.skills.split(',')
-    skill_match_count = sum(1 for skill in resume_skills if skill in job_keywords)
-    experience = resume.experience
-    return [skill_match_count, experience]
+@st.cache_data(max_entries=32, show_spinner=False)
+def read_job_description(file_content, file_type):
+    """Extracts JD text in memory; cached by file bytes so reruns skip the PDF/DOCX parse."""
+    return parser.extract_text_from_bytes(file_content, file_type)
 
 
-def calculate_ranking_score(resume, job_keywords):
-    """Calculates ranking score based on skill match, experience, and ML."""
-    resume_skills_str = resume.skills # Get the skills string from resume object
-    resume_skills = resume_skills_str.split(',') if resume_skills_str else [] # Split string to list
+RESULT_COLUMNS = {"filename": "Filename", "skills": "Skills", "experience": "Experience",
+                  "ranking_score": "Ranking Score", "skill_match_percentage": "Skill Match Percentage",
+                  "semantic_similarity": "Semantic Similarity"}
+RESULTS_PAGE_SIZES = [25, 50, 100, 250]
+EXPORT_MIME_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
 
-    print(f"\n--- calculate_ranking_score for '{resume.filename}' ---") # Debug: Ranking function start
-    print(f"Job Keywords: {job_keywords}")
-    print(f"Resume Skills (raw): {resume.skills}") # Debug: Raw resume skills string
-    print(f"Resume Skills (split): {resume_skills}") # Debug: Split resume skills list
 
-    skill_match_count = 0
-    matched_skills = [] # To track matched skills for debugging
+def results_frame(rows, first_rank):
+    """Builds the displayed table of one page of ranked rows."""
+    df = pd.DataFrame([{RESULT_COLUMNS[key]: value for key, value in row.items() if key in RESULT_COLUMNS}
+                       for row in rows])
+    if len(df):
+        df["Skills"] = df["Skills"].map(lambda skills: skills.split(',') if skills else [])  #Handle empty
+        df.insert(0, "Rank", range(first_rank, first_rank + len(df)))
+    return df
 
-    for resume_skill in resume_skills:
-        for job_keyword in job_keywords:
-            # Changed matching logic to substring and case-insensitive
-            if job_keyword.strip().lower() in resume_skill.strip().lower(): # Substring and case-insensitive match
-                skill_match_count += 1
-                matched_skills.append(resume_skill) # Add to matched skills list
-                logging.debug(f"Skill Match found: Resume Skill: '{resume_skill.strip().lower()}', Job Keyword: '{job_keyword.strip().lower()}'") # Debug log match
-            else:
-                logging.debug(f"No Skill Match: Resume Skill: '{resume_skill.strip().lower()}', Job Keyword: '{job_keyword.strip().lower()}'") # Debug log no match
-
-    print(f"Skill Match Count: {skill_match_count}")
-    print(f"Matched Skills: {matched_skills}") # Debug: Print matched skills
-    total_job_keywords = len(job_keywords)
-    skill_match_percentage = 0  # Default to 0%
-
-    if total_job_keywords > 0:
-        skill_match_percentage = (skill_match_count / total_job_keywords) * 100
-        skill_match_percentage = round(skill_match_percentage, 1) #Round to 1 decimal place
-
-    print(f"Skill Match Percentage: {skill_match_percentage}%") # Debug print percentage
 
-    if model:
-        features = extract_features(resume, job_keywords)
-        try:
-            ml_score = model.predict([features])[0]
-            print(f"ML Score: {ml_score}") # Debug: ML Score
-        except Exception as e:
-            logging.warning(f"Error during model prediction: {e}")
-            ml_score = 0
-            print(f"ML Score Error: {ml_score}") # Debug: ML Error
-    else:
-        ml_score = 0
-        print(f"ML Model Not Loaded: ML Score set to {ml_score}") # Debug: No ML Model
-
-    score = min((skill_match_count * SKILL_MATCH_WEIGHT) + (resume.experience * EXPERIENCE_WEIGHT) + (ml_score * ML_MODEL_WEIGHT), 100)
-    print(f"Final Ranking Score: {score}") # Debug: Final Score
-    return score, skill_match_percentage # Return both scores
-
-
-def extract_keywords_from_job_description(jd_text):
-    """Extracts relevant keywords from the job description."""
-    doc = nlp(jd_text)
-    keywords = set()
-
-    print("\n--- Tokens from Job Description (Detailed Debug) ---")  # Debug print
-    for token in doc:
-        print(f"Token: '{token.text}'")
-        print(f"  POS: {token.pos_}, is_stop: {token.is_stop}, is_punct: {token.is_punct}, is_currency: {token.is_currency}, is_digit: {token.is_digit}, like_num: {token.like_num}")
-        is_pos_ok = token.pos_ in ["NOUN", "ADJ", "PROPN", "VERB"]
-        is_stop_ok = not token.is_stop
-        is_punct_ok = not token.is_punct and not token.is_currency and not token.is_digit
-        is_range_ok = not re.match(r'^\d+-\d+$', token.text) and not token.like_num
-
-        print(f"  POS Check: {is_pos_ok}, Stop Word Check: {is_stop_ok}, Punct/Symbol Check: {is_punct_ok}, Range Check: {is_range_ok}")
-
-
-        if is_pos_ok and is_stop_ok and is_punct_ok and is_range_ok:
-            keywords.add(token.lemma_.lower())
-            print(f"  ==> ADDED Keyword: '{token.text}' (lemma: '{token.lemma_}')") # Indicate when added
-        else:
-            print("  ==> FILTERED OUT") # Indicate when filtered
+def export_results(rows, output_format):
+    """Streams ranked rows into a temporary file with the CLI's writers. Returns (path, output_format).
 
-    print("\n--- Final Extracted Keywords ---")
-    print(keywords)
-    return list(keywords)
+    Rows are written as they arrive, so only the encoded file, not the
+    result set, is ever complete. The previous export of the session is removed.
+    """
+    from cli import WRITERS
 
+    previous = st.session_state.pop('results_export', None)
+    if previous and os.path.exists(previous[0]):
+        os.remove(previous[0])
+    fd, path = tempfile.mkstemp(prefix="ranked_", suffix=f".{output_format}")
+    os.close(fd)
+    writer = WRITERS[output_format](path)
+    try:
+        for rank, row in enumerate(rows, start=1):
+            writer.write({"rank": rank, "filename": row["filename"], "path": None,
+                          "ranking_score": row["ranking_score"], "skill_match_percentage": row["skill_match_percentage"],
+                          "experience": row["experience"], "skills": row["skills"]})
+    finally:
+        writer.close()
+    return path, output_format
+
+
+def semantic_results(job_profile, job_description_text, candidates, weights, semantic_weight):
+    """Ranks the semantic shortlist of the pool. Returns its rows, best first.
+
+    The shortlist is bounded by RANKING_SHORTLIST_SIZE and kept for the
+    session with its features, so weight changes only re-combine them.
+    """
+    with Session() as session:
+        pool_key = (job_profile.content_hash, st.session_state['pool_id'], pool_size(session, st.session_state['pool_id']))
+        pool = st.session_state.get('semantic_pool')
+        if pool is None or pool[0] != pool_key:
+            # Top-k cosine search over the stored resume vectors picks the shortlist
+            matches = semantic_shortlist(session, job_description_text, RANKING_SHORTLIST_SIZE, candidates)
+            resumes = [resume for resume, _ in matches]
+            if metrics.tracing_enabled():
+                for resume in resumes:
+                    TRACE.debug("Fetched Resume: %s, Skills: %s, Experience: %s",
+                                resume.filename, resume.skills, resume.experience)
+            # Stored features are reused; only new resumes are scored, in one matrix product and predict call
+            features = load_features(session, resumes, job_profile)
+            features["semantic_similarity"] = np.array([similarity for _, similarity in matches])
+            pool = st.session_state['semantic_pool'] = (
+                pool_key, [(resume.id, resume.filename, resume.skills or "", resume.experience) for resume in resumes],
+                features)
+
+    _, resumes, features = pool
+    ranking_scores = combine_scores(features, *weights, semantic_weight=semantic_weight)
+    return [{
+        "resume_id": resume_id,
+        "filename": filename,
+        "skills": skills,
+        "experience": experience,
+        "ranking_score": float(ranking_scores[row]),
+        "skill_match_percentage": float(features["skill_match_percentage"][row]),
+        "semantic_similarity": round(float(features["semantic_similarity"][row]), 3),
+    } for row, (resume_id, filename, skills, experience) in
+        ((row, resumes[row]) for row in np.argsort(-ranking_scores, kind="stable").tolist())]
+
+
+@st.cache_resource
+def init_database():
+    """Creates missing tables once per server process rather than on every rerun."""
+    init_db()
+
+
+@st.cache_resource
+def warm_models():
+    """Loads the models on a background thread once per server process, after the first page has rendered."""
+    return model_registry.preload_in_background(["nlp", "skill_matcher", "extractors", "ranking_model"])
 
 
 def main():
+    init_database()
     st.title("AI-Powered Resume Screening and Ranking System")
 
-    print("\n--- main() function execution START ---") # Debug: Track main execution
-
     # --- Sidebar (Optional) ---
     with st.sidebar:
         st.subheader("Select Theme")
         theme = st.radio("Choose a theme", ["Light", "Dark"])  # Not used, but an example
 
         st.subheader("Inputs and Configuration")
-        with st.expander("Ranking Weights Explained"):
-            st.write(f"Skill Match Weight: {SKILL_MATCH_WEIGHT}")
-            st.write(f"Experience Weight: {EXPERIENCE_WEIGHT}")
-            st.write(f"ML Model Weight: {ML_MODEL_WEIGHT}")
+        with st.expander("Ranking Weights", expanded=True):
+            # Features are stored per resume and JD, so moving a slider only re-combines them
+            skill_weight = st.slider("Skill Match Weight", 0.0, 50.0, float(SKILL_MATCH_WEIGHT), 0.5)
+            experience_weight = st.slider("Experience Weight", 0.0, 50.0, float(EXPERIENCE_WEIGHT), 0.5)
+            ml_weight = st.slider("ML Model Weight", 0.0, 50.0, float(ML_MODEL_WEIGHT), 0.5)
+            semantic_weight = st.slider("Semantic Weight", 0.0, 100.0, float(SEMANTIC_WEIGHT), 1.0,
+                                        help="Only used in the Semantic scoring mode")
+        scoring_mode = st.selectbox("Scoring Mode", ["Keyword", "Semantic"],
+                                    help="Semantic blends cosine similarity between resume and JD vectors "
+                                         f"(weight {SEMANTIC_WEIGHT}) into the keyword score")
+        if scoring_mode == "Semantic" and semantic_backend() is None:
+            st.warning("Semantic mode needs an embedding model: set SEMANTIC_MODEL_PATH to a local "
+                       "sentence-transformers model or NLP_MODEL to en_core_web_md/lg. Ranking by keywords.")
+            scoring_mode = "Keyword"
+        with st.expander("NLP Cache"):
+            st.write(doc_cache.stats())  # Hits, misses and evictions of the shared Doc cache
+        with st.expander("Pipeline Metrics"):
+            tracing = st.toggle("Debug tracing", value=metrics.tracing_enabled(),
+                                help="Per-resume debug logs; off costs nothing on the hot path")
+            if tracing != metrics.tracing_enabled():
+                metrics.set_tracing(tracing)
+            metrics_panel = st.container()  # Filled at the end of the run, so it includes this run's timings
 
     # --- Resume Upload Section ---
     st.subheader("Upload Resumes")
@@ -187,111 +177,164 @@ def main():
                                         help="Limit 200MB per file • TXT, DOCX, PDF")
 
     if uploaded_files:
-        print("Resumes Uploaded: Processing...") # Debug: Resume upload detected
-        if 'uploaded_resumes' not in st.session_state:
-            st.session_state['uploaded_resumes'] = []
-
-        for uploaded_file in uploaded_files:
-            filename = uploaded_file.name
-            file_extension = os.path.splitext(filename)[1].lower()
-            file_content = uploaded_file.read()
-
-            with st.spinner(f"Processing resume: {filename}"):
-                skills, experience = process_resume(file_content, filename, file_extension[1:])
-                if skills or experience: # Check if processed
-                    st.success(f"Resume '{filename}' uploaded and processed successfully!")
-                    st.session_state['uploaded_resumes'].append(filename)  # Store filename
-                #No need of else, process_resume already handles the errors
+        # The session's candidates are a pool of content hashes in the database, not a list of filenames
+        pool_id = st.session_state.setdefault('pool_id', new_pool_id())
+        pooled = st.session_state.setdefault('pooled_hashes', set())
+        files = [(uploaded_file.name, uploaded_file.read()) for uploaded_file in uploaded_files]
+        # Only files new to this session are handled; the uploader keeps its files across reruns
+        new_files = [(filename, content, file_hash(content)) for filename, content in files]
+        new_files = [(filename, content, content_hash) for filename, content, content_hash in new_files
+                     if content_hash not in pooled]
+        if new_files and INGEST_USE_QUEUE:
+            # Hand new files to the background worker
+            with Session() as session:
+                batch_id = enqueue(session, [(filename, content) for filename, content, _ in new_files])
+                add_to_pool(session, pool_id, [content_hash for _, _, content_hash in new_files])
+            st.session_state.setdefault('ingest_batches', []).append(batch_id)
+            pooled.update(content_hash for _, _, content_hash in new_files)
+        elif new_files:
+            progress_bar = st.progress(0.0, text=f"Processing {len(new_files)} resumes...")
+            results = ingest_batch([(filename, content) for filename, content, _ in new_files],
+                                   progress=lambda done, total: progress_bar.progress(
+                                       done / total, text=f"Processed {done} of {total} resumes"))
+            with Session() as session:
+                add_to_pool(session, pool_id, [content_hash for _, _, content_hash in new_files])
+            pooled.update(content_hash for _, _, content_hash in new_files)
+
+            errors = [{"Filename": result["filename"], "Error": result["error"]} for result in results if result["error"]]
+            st.success(f"{len(results) - len(errors)} of {len(results)} resumes uploaded and processed successfully!")
+            if errors:
+                st.error(f"{len(errors)} resumes could not be processed:")
+                st.dataframe(pd.DataFrame(errors))
+
+    # --- Background ingestion status ---
+    jobs_pending = 0
+    if st.session_state.get('ingest_batches'):
+        with Session() as session:
+            counts, finished = batch_status(session, st.session_state['ingest_batches'])
+        total_jobs = sum(counts.values())
+        jobs_pending = counts.get(QUEUED, 0) + counts.get(RUNNING, 0)
+        errors = [{"Filename": filename, "Error": error}
+                  for filename, status, _, error in finished if status != DONE]  # Done ones joined the pool by hash
+        if jobs_pending:
+            st.progress((total_jobs - jobs_pending) / total_jobs,
+                        text=f"Processed {total_jobs - jobs_pending} of {total_jobs} resumes "
+                             f"({counts.get(RUNNING, 0)} running). Make sure worker.py is running.")
+        else:
+            st.success(f"{total_jobs - len(errors)} of {total_jobs} resumes uploaded and processed successfully!")
+        if errors:
+            st.error(f"{len(errors)} resumes could not be processed:")
+            st.dataframe(pd.DataFrame(errors))
 
     # --- Job Description Upload ---
     st.subheader("Job Description")
     job_description_file = st.file_uploader("Upload Job Description (.txt, .docx, .pdf)", type=["txt", "docx", "pdf"])
 
     if job_description_file:
-        print("Job Description Uploaded: Processing...") # Debug: JD upload detected
         try:
-            file_extension = os.path.splitext(job_description_file.name)[1].lower()
-            if file_extension == ".txt":
-                job_description_text = job_description_file.read().decode("utf-8")
-            elif file_extension == ".docx":
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                    tmp.write(job_description_file.read())
-                    tmp_path = tmp.name
-                try:
-                    job_description_text = parser.extract_text_from_docx(tmp_path)
-                finally:
-                    os.remove(tmp_path)
-            elif file_extension == ".pdf":
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                    tmp.write(job_description_file.read())
-                    tmp_path = tmp.name
-                try:
-                    job_description_text = parser.extract_text_from_pdf(tmp_path)
-                finally:
-                    os.remove(tmp_path)
-
-            print("\n--- Job Description Text (Before Keyword Extraction) ---") # Debug print: JD Text
-            print(f"First 200 chars of JD Text: {job_description_text[:200]}")
-
-            job_keywords = extract_keywords_from_job_description(job_description_text) # CALL KEYWORD EXTRACTION FUNCTION
+            job_description_text = read_job_description(job_description_file.getvalue(),
+                                                        parser.file_type_of(job_description_file.name))
+
+            TRACE.debug("First 200 chars of JD Text: %s", job_description_text[:200])
+
+            with Session() as session:
+                job_profile = get_job_profile(job_description_text, session)  # NLP runs at most once per distinct JD
+            job_keywords = job_profile.keywords
             st.write("Extracted Job Keywords:", job_keywords) # DISPLAY THE *KEYWORDS* - NOT RAW TEXT
 
         except Exception as e:
             st.error(f"Error processing job description: {e}")
             logging.exception(f"Error processing job description: {e}")
-            job_keywords = []  # Initialize to empty list on error
+            job_profile, job_keywords = None, []  # Initialize to empty on error
 
-        print("\n--- Job Keywords Extracted and Displayed ---") # Debug: Keywords Displayed
 
         # --- Ranking ---
         st.header("Resume Ranking Results")
 
-        if job_keywords and 'uploaded_resumes' in st.session_state and st.session_state['uploaded_resumes']:
-            print("Ranking Resumes...") # Debug: Ranking process started
-            print(f"Job Keywords for Ranking: {job_keywords}") # Debug: Job Keywords for Ranking
-            print(f"Uploaded Resumes for Ranking: {st.session_state['uploaded_resumes']}") # Debug: Uploaded Resumes
+        if job_keywords and st.session_state.get('pooled_hashes'):
+            candidates = pool_filter(st.session_state['pool_id'])
+            weights = (skill_weight, experience_weight, ml_weight)
+            page_size = st.selectbox("Candidates per page", RESULTS_PAGE_SIZES, index=1)
 
-            with Session() as session:
-                # Efficiently fetch only the resumes we need
-                ranked_resumes = session.query(Resume).filter(Resume.filename.in_(st.session_state['uploaded_resumes'])).all() # Renamed to ranked_resumes
-
-                print(f"\n--- Resumes Fetched for Ranking ---") # Debug: Resumes Fetched
-                for resume in ranked_resumes:
-                    print(f"  Fetched Resume: {resume.filename}, Skills: {resume.skills}, Experience: {resume.experience}")
-
-                data = []
-                print(f"\n--- Creating DataFrame for Ranking ---") # Debug: DataFrame Creation
-                for resume in ranked_resumes:
-                    ranking_score, skill_match_percentage = calculate_ranking_score(resume, job_keywords) # Get both scores
-                    print(f"  Resume for DataFrame: {resume.filename}, Ranking Score: {ranking_score}, Skill Match Percentage: {skill_match_percentage}%, Skills: {resume.skills}, Experience: {resume.experience}") # Debug: Data for DataFrame
-                    data.append({
-                        "Filename": resume.filename,
-                        "Skills": resume.skills.split(',') if resume.skills else [], #Handle empty
-                        "Experience": resume.experience,
-                        "Ranking Score": ranking_score,
-                        "Skill Match Percentage": skill_match_percentage # New column
-                    })
-
-                df = pd.DataFrame(data)
-                df = df.sort_values(by="Ranking Score", ascending=False)
-                st.dataframe(df)
-                print("Ranking Table Displayed.") # Debug: Ranking table displayed
+            if scoring_mode == "Semantic":
+                rows = semantic_results(job_profile, job_description_text, candidates, weights, semantic_weight)
+                total = len(rows)
+
+                def fetch_page(offset):
+                    return rows[offset:offset + page_size], offset
+
+                def iter_all(session):
+                    return iter(rows)
+            else:
+                with Session() as session:
+                    # The database counts skill matches; only its shortlist of the pool is scored and ranked
+                    candidates = shortlist_filter(session, job_profile, RANKING_SHORTLIST_SIZE, candidates)
+                    # Only shortlisted resumes without stored features for this JD are scored
+                    ensure_features(session, job_profile, candidates)
+                    total = ranked_count(session, job_profile, candidates)
+                TRACE.debug("Ranking %d pooled resumes against %d job keywords", total, len(job_keywords))
+
+                def fetch_page(after):
+                    with Session() as session:
+                        return ranked_page(session, job_profile, weights, candidates, page_size, after), after
+
+                def iter_all(session):
+                    return iter_ranked(session, job_profile, weights, candidates)
+
+            # Each visited page remembers where it starts: a keyset (score, id) in SQL, an offset in memory
+            view_key = (job_profile.content_hash, scoring_mode, weights, semantic_weight, page_size, total)
+            if st.session_state.get('results_view') != view_key:
+                st.session_state['results_view'] = view_key
+                st.session_state['results_cursors'] = [None if scoring_mode == "Keyword" else 0]
+            cursors = st.session_state['results_cursors']
+            first_rank = (len(cursors) - 1) * page_size + 1
+            with span("scoring"):
+                page, cursor = fetch_page(cursors[-1])
+            if not total:
+                st.write("No resumes to rank yet.")
+            else:
+                st.dataframe(results_frame(page, first_rank), hide_index=True)
+                has_next = first_rank - 1 + len(page) < total
+                if scoring_mode == "Keyword":
+                    next_cursor = (page[-1]["ranking_score"], page[-1]["resume_id"]) if page else None
+                else:
+                    next_cursor = cursor + len(page)
+                previous_col, position_col, next_col = st.columns([1, 3, 1])
+                previous_col.button("Previous", disabled=len(cursors) == 1, on_click=cursors.pop)
+                position_col.write(f"Page {len(cursors)} of {-(-total // page_size)} ({total} candidates)")
+                next_col.button("Next", disabled=not has_next, on_click=cursors.append, args=(next_cursor,))
+
+                export_format = st.radio("Export format", sorted(EXPORT_MIME_TYPES), horizontal=True)
+                if st.button("Prepare export"):
+                    with Session() as session:
+                        st.session_state['results_export'] = export_results(iter_all(session), export_format)
+                export = st.session_state.get('results_export')
+                if export:
+                    path, export_format = export
+                    with open(path, "rb") as f:
+                        st.download_button(f"Download {export_format.upper()}", f, file_name=f"ranked.{export_format}",
+                                           mime=EXPORT_MIME_TYPES[export_format])
         elif not job_keywords:
             st.write("Please upload a job description to begin the ranking process.")
-            print("No Job Description Message Displayed.") # Debug: No JD message
-        elif 'uploaded_resumes' not in st.session_state or not st.session_state['uploaded_resumes']:
-            st.write("Please upload resumes to begin the ranking process.")
-            print("No Resumes Message Displayed (Initial).") # Debug: No resumes message
         else:
-            st.write("No resumes to rank.")
-            print("No Resumes to Rank Message Displayed.") # Debug: No resumes to rank message
+            st.write("Please upload resumes to begin the ranking process.")
+
+    # --- Pipeline Metrics ---
+    with metrics_panel:
+        st.dataframe(pd.DataFrame(metrics.summary()), hide_index=True)
+        st.write("Model load seconds:", {name: round(seconds, 2) for name, seconds in model_registry.load_times().items()})
+        st.download_button("Download Prometheus metrics", metrics.render_prometheus(),
+                           file_name="metrics.prom", mime="text/plain")
+    if METRICS_PATH:
+        metrics.write_prometheus(METRICS_PATH)
+    warm_models()
 
-    print("\n--- main() function execution END ---") # Debug: Track main execution
+    if jobs_pending:
+        time.sleep(UI_POLL_SECONDS)  # Poll the queue until this session's uploads are done
+        st.rerun()
 
 
 if __name__ == "__main__":
-    from models import Base, engine  # Local import to avoid circular dependency
-    Base.metadata.create_all(engine)  # Create tables if they don't exist
-    if not os.path.exists("uploads"):  # You don't actually need this with tempfile
-        os.makedirs("uploads")
+    if METRICS_PORT:
+        metrics.start_metrics_server(METRICS_PORT)  # Binds once per process, later reruns reuse it
     main()
\ No newline at end of file
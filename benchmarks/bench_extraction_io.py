@@ -0,0 +1,70 @@
+"""Benchmarks in-memory text extraction against the previous temp-file round trip.
+
+Usage: python benchmarks/bench_extraction_io.py --docs 50 --words 800
+"""
+import argparse
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.dirname(__file__))
+from resume_parser import parser
+from corpus import synthetic_resume_text, synthetic_pdf_bytes, synthetic_docx_bytes
+
+
+def via_temp_file(file_content, file_type):
+    """What process_resume did before: write the upload to disk, extract from the path, delete it."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_type}") as tmp:
+        tmp.write(file_content)
+        tmp_path = tmp.name
+    try:
+        with open(tmp_path, "rb") as f:  # Same parser input as before, read back from disk
+            return parser.extract_text_from_bytes(f.read(), file_type)
+    finally:
+        os.remove(tmp_path)
+
+
+def time_per_doc(func, documents, file_type):
+    func(documents[0], file_type)  # Warm up imports and caches outside the timing
+    start = time.perf_counter()
+    for document in documents:
+        func(document, file_type)
+    return (time.perf_counter() - start) / len(documents) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--docs", type=int, default=50)
+    arg_parser.add_argument("--words", type=int, default=800)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(42)
+    texts = [synthetic_resume_text(rng, parser.SKILL_LIST, args.words) for _ in range(args.docs)]
+    corpora = {
+        "pdf": [synthetic_pdf_bytes(text) for text in texts],
+        "docx": [synthetic_docx_bytes(text) for text in texts],
+    }
+
+    print(f"{'type':<5} {'avg KB':>7} {'temp file ms':>13} {'in memory ms':>13} {'saved ms/doc':>13}")
+    for file_type, documents in corpora.items():
+        temp_ms = time_per_doc(via_temp_file, documents, file_type)
+        memory_ms = time_per_doc(parser.extract_text_from_bytes, documents, file_type)
+        avg_kb = sum(len(document) for document in documents) / len(documents) / 1024
+        print(f"{file_type:<5} {avg_kb:>7.1f} {temp_ms:>13.2f} {memory_ms:>13.2f} {temp_ms - memory_ms:>13.2f}")
+
+    long_pdf = synthetic_pdf_bytes("\n".join(texts * 4))
+    start = time.perf_counter()
+    pages = sum(1 for _ in parser.iter_pdf_pages(io.BytesIO(long_pdf), max_pages=5))
+    print(f"Capped extraction: first {pages} pages of a {len(long_pdf) // 1024} KB PDF "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
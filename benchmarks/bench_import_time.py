@@ -0,0 +1,154 @@
+"""Measures cold-start cost: import time of each entry point and first-use model load times.
+
+Usage:
+    python benchmarks/bench_import_time.py -o startup.json
+    python benchmarks/bench_import_time.py --repeat 7 --baseline startup.json
+
+Each entry point is imported in a fresh interpreter with -X importtime,
+--repeat times. The report gives p50/p95 import seconds, the child's peak
+RSS and the slowest imported packages, plus which heavy libraries (spaCy,
+pdfminer, ...) the import pulled in, which should be none now that they
+load on first use. Model load times come from model_registry after a
+preload in another fresh interpreter. The JSON has the same layout as
+suite.py, so --baseline/--compare work the same way.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.dirname(__file__))
+from suite import compare, git_commit, load
+
+ENTRY_POINTS = {
+    "app": "import app",
+    "worker": "import worker",
+    "cli": "import cli",
+    "ingest": "import ingest",
+    "ranking": "import ranking",
+    "parser": "from resume_parser import parser",
+}
+HEAVY_MODULES = ["spacy", "pdfminer", "docx", "joblib", "sklearn", "scipy", "sentence_transformers", "torch"]
+PRELOAD = "import ingest, ranking, model_registry; model_registry.preload(); print(json.dumps(model_registry.load_times()))"
+
+
+def child_env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)  # Same module resolution as this process
+    env.setdefault("SQLITE_PATH", os.path.join(tempfile.gettempdir(), "bench_import_time.db"))  # No MySQL driver needed
+    return env
+
+
+def run_child(code, importtime=False):
+    """Runs code in a fresh interpreter. Returns (stdout, stderr, peak RSS in MB)."""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    # Output goes to files, not pipes: -X importtime easily fills a pipe buffer, and reading the pipes
+    # to completion would reap the child before os.wait4 can collect its rusage
+    with tempfile.TemporaryFile("w+") as out, tempfile.TemporaryFile("w+") as err:
+        process = subprocess.Popen(command, cwd=PROJECT_ROOT, env=child_env(), stdout=out, stderr=err)
+        _, status, usage = os.wait4(process.pid, 0)  # Resource usage of exactly this child
+        process.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        err.seek(0)
+        stdout, stderr = out.read(), err.read()
+    if process.returncode:
+        raise RuntimeError(stderr.strip().splitlines()[-1] if stderr.strip() else f"exit code {process.returncode}")
+    peak_mb = usage.ru_maxrss / (1024 * 1024) if sys.platform == "darwin" else usage.ru_maxrss / 1024
+    return stdout, stderr, peak_mb
+
+
+def parse_importtime(stderr):
+    """Returns (total seconds, {top-level package: cumulative seconds}) from -X importtime output."""
+    total = 0.0
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        seconds = int(cumulative) / 1e6
+        if not name.startswith("  "):
+            total += seconds  # Top-level imports of the -c code
+        package = name.strip().split(".")[0]
+        packages[package] = max(packages.get(package, 0.0), seconds)
+    return total, packages
+
+
+def bench_entry_point(code, repeat):
+    seconds, peaks, packages = [], [], {}
+    for _ in range(repeat):
+        _, stderr, peak_mb = run_child(code, importtime=True)
+        total, run_packages = parse_importtime(stderr)
+        seconds.append(total)
+        peaks.append(peak_mb)
+        packages = run_packages
+    stdout, _, _ = run_child(f"{code}; import sys, json; print(json.dumps(sorted(sys.modules)))")
+    loaded = set(json.loads(stdout))
+    p50 = float(np.percentile(seconds, 50))
+    return {
+        "ops": repeat,
+        "throughput": round(1 / p50, 3),  # Cold starts per second
+        "p50_ms": round(p50 * 1000, 1),
+        "p95_ms": round(float(np.percentile(seconds, 95)) * 1000, 1),
+        "total_s": round(sum(seconds), 3),
+        "peak_rss_mb": round(max(peaks), 1),
+        "slowest_packages": {name: round(value * 1000, 1) for name, value
+                             in sorted(packages.items(), key=lambda item: -item[1])[:10]},
+        "heavy_modules_imported": [name for name in HEAVY_MODULES if name in loaded],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per entry point")
+    arg_parser.add_argument("--entry-points", nargs="+", choices=sorted(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    arg_parser.add_argument("--no-models", action="store_true", help="Skip the model load measurement")
+    arg_parser.add_argument("-o", "--output", help="Write the results JSON here (default: stdout)")
+    arg_parser.add_argument("--baseline", help="Results JSON of an earlier commit to compare this run against")
+    arg_parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                            help="Compare two saved results files without running")
+    arg_parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = arg_parser.parse_args()
+
+    if args.compare:
+        return 1 if compare(load(args.compare[0]), load(args.compare[1]), args.threshold) else 0
+
+    results, errors = {}, {}
+    for name in args.entry_points:
+        try:
+            results[f"import.{name}"] = bench_entry_point(ENTRY_POINTS[name], args.repeat)
+        except RuntimeError as e:
+            errors[f"import.{name}"] = str(e)  # e.g. streamlit not installed
+    if not args.no_models:
+        try:
+            stdout, _, peak_mb = run_child("import json; " + PRELOAD)
+            for model, seconds in json.loads(stdout.strip().splitlines()[-1]).items():
+                results[f"model_load.{model}"] = {"ops": 1, "throughput": round(1 / max(seconds, 1e-6), 3),
+                                                  "p50_ms": round(seconds * 1000, 1), "p95_ms": round(seconds * 1000, 1),
+                                                  "total_s": round(seconds, 3), "peak_rss_mb": round(peak_mb, 1)}
+        except RuntimeError as e:
+            errors["model_load"] = str(e)
+
+    report = {"meta": {"commit": git_commit(), "python": sys.version.split()[0], "repeat": args.repeat},
+              "results": results, "errors": errors}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        out = sys.stdout if args.output else sys.stderr  # Keep stdout valid JSON
+        return 1 if compare(load(args.baseline), report, args.threshold, out) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
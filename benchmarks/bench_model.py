@@ -0,0 +1,62 @@
+"""Benchmarks scoring model inference: per-row sklearn predict against the artifact's dot product.
+
+Usage: python benchmarks/bench_model.py --rows 1000 100000 1000000
+
+Fits LinearRegression on train_data.csv and converts it to a
+LinearScoringModel, so both paths hold the same coefficients. Per-row
+paths are timed on at most --per-row-limit rows (they are slow) and
+reported as predictions per second.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+from scoring_model import FEATURES, LinearScoringModel
+
+
+def rate(func, rows):
+    start = time.perf_counter()
+    predictions = func(rows)
+    return len(rows) / (time.perf_counter() - start), np.asarray(predictions, dtype=np.float64)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000, 1000000])
+    arg_parser.add_argument("--per-row-limit", type=int, default=10000, help="Rows timed on the per-row paths")
+    args = arg_parser.parse_args()
+
+    data = pd.read_csv(os.path.join(PROJECT_ROOT, "train_data.csv"))
+    estimator = LinearRegression().fit(data[list(FEATURES)].values, data['suitability_score'])
+    model = LinearScoringModel.from_estimator(estimator)
+
+    paths = {
+        "sklearn per-row": lambda X: [estimator.predict([row])[0] for row in X.tolist()],  # Today's calculate_ranking_score
+        "artifact per-row": lambda X: [model.predict([row])[0] for row in X.tolist()],
+        "sklearn batch": estimator.predict,
+        "artifact batch": model.predict,
+    }
+    print(f"{'rows':>8} " + " ".join(f"{name:>17}" for name in paths) + "  speedup  identical")
+    rng = np.random.default_rng(42)
+    for size in args.rows:
+        X = np.column_stack([rng.integers(0, 20, size), rng.integers(0, 30, size)]).astype(np.float64)
+        rates, identical = [], True
+        reference = estimator.predict(X)
+        for name, func in paths.items():
+            rows = X[:args.per_row_limit] if "per-row" in name else X
+            per_second, predictions = rate(func, rows)
+            rates.append(per_second)
+            identical = identical and np.allclose(predictions, reference[:len(rows)], rtol=0, atol=1e-9)
+        print(f"{size:>8} " + " ".join(f"{value:>13.0f}/s  " for value in rates)
+              + f"{rates[-1] / rates[0]:>7.0f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
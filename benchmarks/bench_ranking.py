@@ -0,0 +1,75 @@
+"""Benchmarks vectorized rank_batch against per-resume calculate_ranking_score.
+
+Usage: python benchmarks/bench_ranking.py --sizes 1000 10000 100000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+from resume_parser import parser
+from ranking import calculate_ranking_score, rank_batch, get_model
+
+Candidate = namedtuple("Candidate", ["filename", "skills", "experience"])
+
+
+def load_model():
+    """Uses the trained model if present, otherwise fits one on train_data.csv."""
+    model = get_model()
+    if model is None:
+        data = pd.read_csv(os.path.join(PROJECT_ROOT, "train_data.csv"))
+        model = LinearRegression().fit(data[['skill_match_count', 'experience']].values, data['suitability_score'])
+    return model
+
+
+def synthetic_pool(n, seed=42):
+    rng = random.Random(seed)
+    skills = [skill.lower() for skill in parser.SKILL_LIST]
+    return [Candidate(f"resume_{i}.txt", ','.join(rng.sample(skills, rng.randint(0, 15))), rng.randint(0, 20))
+            for i in range(n)]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    arg_parser.add_argument("--keywords", type=int, default=20, help="Job description keywords")
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    model = load_model()
+    import model_registry
+    model_registry.put("ranking_model", model)  # Same model for both paths
+
+    rng = random.Random(7)
+    job_keywords = rng.sample([skill.lower() for skill in parser.SKILL_LIST], args.keywords) + ["experience", "team"]
+
+    print(f"{'resumes':>8} {'per-resume s':>13} {'batch s':>9} {'speedup':>8}  identical")
+    for size in args.sizes:
+        pool = synthetic_pool(size)
+
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            expected = [calculate_ranking_score(resume, job_keywords) for resume in pool]
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores, percentages = rank_batch(pool, job_keywords, model)
+        batch_seconds = time.perf_counter() - start
+
+        identical = (np.allclose(scores, [score for score, _ in expected], rtol=0, atol=1e-9)
+                     and percentages.tolist() == [percentage for _, percentage in expected])
+        print(f"{size:>8} {loop_seconds:>13.3f} {batch_seconds:>9.4f} {loop_seconds / batch_seconds:>7.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmarks sectioned extraction against parsing the whole resume, on long resumes.
+
+Usage: python benchmarks/bench_sectioning.py --docs 50 --words 3000
+
+"before" runs the pipeline over the whole text and sums every "N years"
+found in DATE entities and again by regex, like extract_experience_nlp
+did before sectioning. "after" is the current parser: the pipeline runs
+on the summary, experience and skills sections only and experience comes
+from merged date ranges. The report shows tokens the pipeline processed
+per resume, seconds per resume and the mean absolute error of the
+extracted years against the synthetic resumes' true experience.
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.dirname(__file__))
+from resume_parser import parser
+from corpus import synthetic_long_resume
+from nlp_cache import doc_cache, get_nlp
+
+
+def legacy_parse(text):
+    """Skills and experience as extracted before sectioning. Returns (skills, years, tokens)."""
+    doc = get_nlp()(text)
+    skills = dict.fromkeys(parser.get_skill_matcher().match_doc(doc))
+    for ent in doc.ents:
+        if ent.label_ == "ORG" and any(keyword in ent.text.lower() for keyword in parser.SKILL_KEYWORDS):
+            skills[ent.text] = None
+    years = 0
+    for ent in doc.ents:
+        if ent.label_ == "DATE":
+            match = re.search(r"(\d+)\s*years", ent.text, re.IGNORECASE)
+            if match:
+                years += int(match.group(1))
+    years += sum(int(match) for match in re.findall(r"(\d+)\+?\s*years", doc.text, re.IGNORECASE))
+    return list(skills), years, len(doc)
+
+
+def sectioned_parse(text):
+    """The current parser. Returns (skills, years, tokens)."""
+    skills = parser.extract_skills_nlp(text)
+    years = parser.extract_experience_nlp(text)
+    return skills, years, len(get_nlp().make_doc(parser.section_text(text)))
+
+
+def run(name, func, corpus):
+    doc_cache.clear()
+    start = time.perf_counter()
+    results = [func(text) for text, _ in corpus]
+    seconds = (time.perf_counter() - start) / len(corpus)
+    tokens = sum(tokens for _, _, tokens in results) / len(corpus)
+    error = sum(abs(years - true_years) for (_, years, _), (_, true_years) in zip(results, corpus)) / len(corpus)
+    print(f"{name:<8} {tokens:>10.0f} {seconds * 1000:>10.1f} {error:>14.2f}")
+    return tokens, seconds, results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--docs", type=int, default=50)
+    arg_parser.add_argument("--words", type=int, default=3000, help="Approximate words per resume")
+    arg_parser.add_argument("--jobs", type=int, default=6, help="Dated jobs per resume")
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(42)
+    corpus = [synthetic_long_resume(rng, parser.SKILL_LIST, args.jobs, args.words) for _ in range(args.docs)]
+    parser.extract_skills_nlp(corpus[0][0])  # Loads the model and compiles the skill matcher
+
+    print(f"{'':<8} {'tokens/doc':>10} {'ms/doc':>10} {'years abs err':>14}")
+    before_tokens, before_seconds, before = run("before", legacy_parse, corpus)
+    after_tokens, after_seconds, after = run("after", sectioned_parse, corpus)
+    same_skills = sum(set(old) <= set(new) for (old, _, _), (new, _, _) in zip(before, after))
+    print(f"{before_tokens / after_tokens:.1f}x fewer tokens, {before_seconds / after_seconds:.1f}x faster; "
+          f"{same_skills} of {len(corpus)} resumes keep all their skills")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmarks the compiled skill matcher against the previous per-word extraction.
+
+Usage: python benchmarks/bench_skill_extraction.py --docs 50 --words 400
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.dirname(__file__))
+from resume_parser import parser
+from corpus import synthetic_corpus
+from nlp_cache import get_nlp
+
+
+def legacy_extract_skills(text):
+    """The extraction loop used before the compiled matcher: one spaCy run per word."""
+    nlp = get_nlp()
+    doc = nlp(text)
+    skills = set()
+    potential_skill_phrases = []
+    for phrase_delimiter in ['\n', ',']:
+        for phrase in text.split(phrase_delimiter):
+            potential_skill_phrases.extend(phrase.strip().split())
+    for phrase in potential_skill_phrases:
+        for token in nlp(phrase):
+            if token.pos_ in ["NOUN", "ADJ"] and token.text in parser.SKILL_LIST:
+                skills.add(token.text)
+    for ent in doc.ents:
+        if ent.label_ == "ORG" and any(keyword in ent.text.lower() for keyword in parser.SKILL_KEYWORDS):
+            skills.add(ent.text)
+    return list(skills)
+
+
+def run(name, func, texts):
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {len(texts) / elapsed:10.1f} resumes/s {elapsed / len(texts) * 1000:10.2f} ms/resume")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--docs", type=int, default=50, help="Number of synthetic resumes")
+    arg_parser.add_argument("--words", type=int, default=400, help="Approximate words per resume")
+    arg_parser.add_argument("--skills", type=int, default=12, help="Skills mentioned per resume")
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.INFO)  # Keep the per-resume log lines out of the timings
+    texts = synthetic_corpus(parser.SKILL_LIST, args.docs, args.words, args.skills)
+
+    legacy = run("legacy (per word)", legacy_extract_skills, texts)
+    current = run("extract_skills_nlp", parser.extract_skills_nlp, texts)
+    run("matcher only", parser.get_skill_matcher().match_text, texts)
+    print(f"Speedup vs legacy: {legacy / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
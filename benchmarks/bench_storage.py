@@ -0,0 +1,157 @@
+"""Measures resume storage size and the memory the ranking load takes, before and after compression.
+
+Usage: python benchmarks/bench_storage.py --docs 100000 --words 600
+
+Writes the same synthetic resumes into two throwaway SQLite databases: one
+with the old schema (plain TEXT text_content) and one through models.py
+(compressed, deferred text). Reports both file sizes, then for each way
+of loading the pool for ranking: every full row with its text, as
+session.query(Resume).all() used to, the same ORM query now that the text
+is deferred, and the compact ranking_query projection. Each load reports
+its time and peak Python allocations (tracemalloc), plus the peak RSS of
+a fresh process running only that load and how much the load grew it
+(the peak is a per-process high-water mark, so each load needs its own). The synthetic text repeats
+a small vocabulary, so real resumes compress somewhat less.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.dirname(__file__))
+from corpus import synthetic_resume_text
+from suite import peak_rss_mb
+
+LEGACY_SCHEMA = ("CREATE TABLE resumes (id INTEGER PRIMARY KEY, filename VARCHAR(255), text_content TEXT, "
+                 "skills TEXT, experience INTEGER, ranking_score INTEGER, ml_score INTEGER)")
+
+
+def synthetic_rows(n, words, seed=42):
+    from resume_parser import parser
+    rng = random.Random(seed)
+    lowered = [skill.lower() for skill in parser.SKILL_LIST]
+    for i in range(n):
+        yield (f"resume_{i}.txt", synthetic_resume_text(rng, parser.SKILL_LIST, words),
+               ','.join(rng.sample(lowered, rng.randint(0, 15))), rng.randint(0, 20))
+
+
+def measure(func):
+    """Returns (seconds, peak MB of Python allocations, rows) of one load."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / (1024 * 1024), len(rows)
+
+
+def database_paths(db_dir):
+    import config
+    legacy_path, current_path = os.path.join(db_dir, "legacy.db"), os.path.join(db_dir, "current.db")
+    config.DATABASE_URL = f"sqlite:///{current_path}"  # Must precede the models import
+    return legacy_path, current_path
+
+
+def ranking_loads(legacy_path, current_path):
+    """The ways of loading the pool for ranking, as {name: function returning the rows}."""
+    from sqlalchemy import text
+    from sqlalchemy.orm import sessionmaker, undefer
+    from models import Resume, create_db_engine, ranking_query
+
+    legacy_engine = create_db_engine(f"sqlite:///{legacy_path}")
+    engine = create_db_engine(f"sqlite:///{current_path}")
+    Session = sessionmaker(bind=engine)
+    return {
+        "raw rows, plain text (before)": lambda: legacy_engine.connect().execute(
+            text("SELECT id, filename, text_content, skills, experience, ranking_score, ml_score FROM resumes")).all(),
+        "full rows, compressed text": lambda: Session().query(Resume).options(undefer(Resume.text_content)).all(),
+        "ORM rows, deferred text": lambda: Session().query(Resume).all(),
+        "ranking_query projection": lambda: ranking_query(Session()).all(),
+    }
+
+
+def measure_rss(db_dir, name):
+    """Runs one load in a fresh interpreter. Returns (peak RSS MB, RSS growth MB during the load)."""
+    completed = subprocess.run([sys.executable, __file__, "--rss-load", name, "--db-dir", db_dir],
+                               capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result["peak_rss_mb"], result["rss_growth_mb"]
+
+
+def process_peak_rss_mb():
+    """Peak RSS of this process image. Linux keeps ru_maxrss across exec, so a child of the
+    already large benchmark process would report the parent's peak; VmHWM starts over."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def rss_child(db_dir, name):
+    load = ranking_loads(*database_paths(db_dir))[name]
+    before = process_peak_rss_mb()  # After the imports and engine setup, so only the load itself counts as growth
+    load()
+    after = process_peak_rss_mb()
+    print(json.dumps({"peak_rss_mb": after, "rss_growth_mb": after - before}))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--docs", type=int, default=20000)
+    arg_parser.add_argument("--words", type=int, default=600, help="Approximate words per resume")
+    arg_parser.add_argument("--rss-load", help=argparse.SUPPRESS)  # Child process of measure_rss
+    arg_parser.add_argument("--db-dir", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.rss_load:
+        return rss_child(args.db_dir, args.rss_load)
+    db_dir = tempfile.mkdtemp(prefix="bench_storage_")
+    legacy_path, current_path = database_paths(db_dir)
+
+    from sqlalchemy.orm import sessionmaker
+    from models import Base, Resume, bulk_insert, create_db_engine
+
+    legacy = sqlite3.connect(legacy_path)
+    legacy.execute(LEGACY_SCHEMA)
+    legacy.executemany("INSERT INTO resumes (filename, text_content, skills, experience) VALUES (?, ?, ?, ?)",
+                       synthetic_rows(args.docs, args.words))
+    legacy.commit()
+    legacy.close()
+
+    engine = create_db_engine(f"sqlite:///{current_path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        bulk_insert(session, (Resume(filename=filename, text_content=content, skills=skills, experience=experience)
+                              for filename, content, skills, experience in synthetic_rows(args.docs, args.words)))
+        session.commit()
+    engine.dispose()  # Checkpoints the WAL into the database file
+
+    legacy_mb, current_mb = os.path.getsize(legacy_path) / 2**20, os.path.getsize(current_path) / 2**20
+    print(f"{args.docs} resumes: legacy {legacy_mb:.1f} MB, compressed {current_mb:.1f} MB "
+          f"({legacy_mb / current_mb:.1f}x smaller)")
+
+    print(f"{'load':<32} {'seconds':>9} {'alloc MB':>9} {'peak RSS MB':>12} {'RSS growth MB':>14}")
+    for name, load in ranking_loads(legacy_path, current_path).items():
+        seconds, peak_mb, _ = measure(load)
+        rss_mb, growth_mb = measure_rss(db_dir, name)
+        print(f"{name:<32} {seconds:>9.3f} {peak_mb:>9.1f} {rss_mb:>12.1f} {growth_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Synthetic resume and job description text for the benchmark scripts."""
+import random
+
+FILLER_WORDS = [
+    "designed", "implemented", "maintained", "delivered", "improved", "owned", "team", "product",
+    "customer", "pipeline", "service", "platform", "reporting", "quality", "release", "stakeholders",
+    "performance", "migration", "feature", "roadmap", "analysis", "support", "internal", "tooling",
+]
+
+SECTION_HEADERS = ["Summary", "Experience", "Skills", "Education", "Projects"]
+
+
+def synthetic_resume_text(rng, skills, n_words=400, n_skills=12, years=None):
+    """Returns a plain-text resume of roughly n_words words mentioning n_skills skills."""
+    chosen = rng.sample(skills, min(n_skills, len(skills)))
+    years = rng.randint(1, 15) if years is None else years
+    lines = [f"Candidate {rng.randint(1000, 9999)}"]
+    per_section = max(n_words // len(SECTION_HEADERS), 1)
+    for header in SECTION_HEADERS:
+        lines.append(header)
+        if header == "Skills":
+            lines.append(", ".join(chosen))
+            continue
+        words = [rng.choice(FILLER_WORDS) for _ in range(per_section)]
+        if header == "Experience":
+            words.insert(0, f"{years} years of experience.")
+        lines.append(" ".join(words) + ".")
+    return "\n".join(lines)
+
+
+def synthetic_long_resume(rng, skills, n_jobs=6, n_words=3000, n_skills=12, end_year=2024):
+    """Returns (text, true years) of a long sectioned resume with dated, partly overlapping jobs.
+
+    Most of the words go to education, projects and publications, which
+    the experience and skill extraction do not need to parse.
+    """
+    chosen = rng.sample(skills, min(n_skills, len(skills)))
+    months = []
+    jobs = []
+    end = end_year * 12
+    for _ in range(n_jobs):
+        length = rng.randint(6, 48)
+        start = end - length
+        if rng.random() < 0.3:
+            start -= rng.randint(1, 6)  # Overlaps the next job, like a side contract
+        months.extend(range(start, end))
+        jobs.append(f"Engineer, Company {rng.randint(1, 99)}  {_month_name(start)} - {_month_name(end - 1)}\n"
+                    + " ".join(rng.choice(FILLER_WORDS) for _ in range(40)) + ".")
+        end = start - rng.randint(0, 6)
+    true_years = len(set(months)) // 12
+
+    per_section = max(n_words // 3, 1)
+    lines = [f"Candidate {rng.randint(1000, 9999)}", "candidate@example.com",
+             "Summary", f"Engineer with {true_years}+ years of experience. "
+             + " ".join(rng.choice(FILLER_WORDS) for _ in range(30)),
+             "Experience", *jobs,
+             "Skills", ", ".join(chosen)]
+    for header in ("Education", "Projects", "Publications"):
+        lines.append(header)
+        lines.append(" ".join(rng.choice(FILLER_WORDS) for _ in range(per_section)) + ".")
+    return "\n".join(lines), true_years
+
+
+def _month_name(index):
+    year, month = divmod(index, 12)
+    return f"{['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'][month]} {year}"
+
+
+def synthetic_corpus(skills, n_docs, n_words=400, n_skills=12, seed=42):
+    """Returns a reproducible list of synthetic resume texts."""
+    rng = random.Random(seed)
+    return [synthetic_resume_text(rng, skills, n_words, n_skills) for _ in range(n_docs)]
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def synthetic_pdf_bytes(text, lines_per_page=45, chars_per_line=90):
+    """Renders text into a minimal multi-page PDF (Helvetica, no dependencies)."""
+    lines = []
+    for paragraph in text.split("\n"):
+        while len(paragraph) > chars_per_line:
+            cut = paragraph.rfind(" ", 0, chars_per_line)
+            cut = cut if cut > 0 else chars_per_line
+            lines.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        lines.append(paragraph)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page_lines) + " ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1', 'replace'))} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1", "replace")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def synthetic_docx_bytes(text):
+    """Renders text into a .docx file, one paragraph per line (requires python-docx)."""
+    import io
+    import docx
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def synthetic_job_description(rng, skills, n_words=150, n_skills=10):
+    """Returns a plain-text job description asking for n_skills skills."""
+    chosen = rng.sample(skills, min(n_skills, len(skills)))
+    words = [rng.choice(FILLER_WORDS) for _ in range(n_words)]
+    return "\n".join([
+        "Job Description",
+        " ".join(words) + ".",
+        f"Requirements: {rng.randint(1, 8)}+ years of experience with " + ", ".join(chosen) + ".",
+    ])
+
+
+RENDERERS = {
+    "txt": lambda text: text.encode("utf-8"),
+    "docx": synthetic_docx_bytes,
+    "pdf": synthetic_pdf_bytes,
+}
+
+
+def synthetic_files(skills, n_docs, file_type, n_words=400, n_skills=12, seed=42):
+    """Returns [(filename, bytes)] of reproducible synthetic resumes rendered as file_type."""
+    render = RENDERERS[file_type]
+    return [(f"resume_{seed}_{i}.{file_type}", render(text))
+            for i, text in enumerate(synthetic_corpus(skills, n_docs, n_words, n_skills, seed))]
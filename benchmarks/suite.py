@@ -0,0 +1,263 @@
+"""End-to-end benchmark suite: parsing, ingestion into SQLite and ranking on a synthetic corpus.
+
+Usage:
+    python benchmarks/suite.py --docs 100 --words 400 --skills 12 -o results.json
+    python benchmarks/suite.py --docs 100 -o new.json --baseline results.json
+    python benchmarks/suite.py --compare results.json new.json
+
+Every benchmark reports ops, throughput (ops/s), p50/p95 latency in ms and
+the process's peak RSS after it ran (a high-water mark, so it only grows
+from one benchmark to the next). Batch benchmarks time the whole batch and
+report the mean per item as p50/p95. The JSON output also records the git
+commit and the parameters, so runs from different commits can be compared
+with --compare or --baseline; the exit code is 1 when a benchmark regressed
+by more than --threshold.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.dirname(__file__))
+from corpus import synthetic_files, synthetic_job_description
+
+FILE_TYPES = ("txt", "docx", "pdf")
+
+Candidate = namedtuple("Candidate", ["filename", "skills", "experience"])
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # Bytes on macOS, KiB on Linux
+
+
+def summarize(latencies, total_seconds=None):
+    """Turns per-operation latencies (seconds) into the reported statistics."""
+    latencies = np.asarray(latencies, dtype=np.float64)
+    total_seconds = latencies.sum() if total_seconds is None else total_seconds
+    return {
+        "ops": int(len(latencies)),
+        "throughput": round(len(latencies) / total_seconds, 3) if total_seconds else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3) if len(latencies) else None,
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 3) if len(latencies) else None,
+        "total_s": round(float(total_seconds), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def time_each(func, items):
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_parser(results, corpora):
+    from resume_parser import parser
+    from nlp_cache import doc_cache
+
+    for file_type, files in corpora.items():
+        parser.extract_text_from_bytes(files[0][1], file_type)  # Warm up imports outside the timing
+        results[f"parser.extract_text.{file_type}"] = time_each(
+            lambda item: parser.extract_text_from_bytes(item[1], file_type), files)
+
+    file_type, files = next(iter(corpora.items()))
+    texts = [parser.extract_text_from_bytes(content, file_type) for _, content in files]
+    parser.extract_skills_nlp(texts[0])  # Loads the spaCy model and compiles the skill matcher
+    doc_cache.clear()
+    results["parser.extract_skills_nlp"] = time_each(parser.extract_skills_nlp, texts)  # Includes the NLP parse
+    results["parser.extract_experience_nlp"] = time_each(parser.extract_experience_nlp, texts)  # Sectioning and date ranges, no NLP
+    doc_cache.clear()
+
+
+def bench_ingest(results, corpora, skills, args):
+    from models import Session, Resume
+    from ingest import ingest_resume, ingest_batch
+    from nlp_cache import doc_cache
+
+    for file_type, files in corpora.items():
+        def process(item):
+            filename, content = item
+            with Session() as session:  # One session per upload, like app.process_resume
+                ingest_resume(session, content, filename, file_type)
+        doc_cache.clear()
+        results[f"ingest.process_resume.{file_type}"] = time_each(process, files)
+
+    doc_cache.clear()
+    batch = synthetic_files(skills, args.docs, "txt", args.words, args.skills, seed=args.seed + 1)
+    start = time.perf_counter()
+    ingest_batch(batch, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+    results["ingest.ingest_batch.txt"] = summarize([elapsed / len(batch)] * len(batch), elapsed)
+
+    # Re-uploading the same files is answered from the stored rows
+    start = time.perf_counter()
+    ingest_batch(batch, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+    results["ingest.ingest_batch.reupload"] = summarize([elapsed / len(batch)] * len(batch), elapsed)
+
+    with Session() as session:
+        return session.query(Resume).count()
+
+
+def bench_ranking(results, skills, args):
+    from models import Session, Resume
+    from nlp_cache import doc_cache
+    from jd_profile import get_job_profile
+    from candidate_pool import new_pool_id, add_to_pool, pool_filter
+    from score_store import ensure_features, ranked_page
+    from skill_index import shortlist_filter
+    from ranking import rank_batch
+    from config import SKILL_MATCH_WEIGHT, EXPERIENCE_WEIGHT, ML_MODEL_WEIGHT, RANKING_SHORTLIST_SIZE
+
+    rng = random.Random(args.seed)
+    job_descriptions = [synthetic_job_description(rng, skills, n_skills=args.jd_skills) for _ in range(args.queries)]
+
+    pool_id = new_pool_id()
+    with Session() as session:
+        add_to_pool(session, pool_id, [content_hash for content_hash, in session.query(Resume.content_hash)])
+    in_pool = pool_filter(pool_id)
+    weights = (SKILL_MATCH_WEIGHT, EXPERIENCE_WEIGHT, ML_MODEL_WEIGHT)
+
+    def rank(jd_text):
+        """The app's keyword path: JD profile, SQL skill shortlist of the pool, features of its unscored
+        resumes, first page ranked in SQL."""
+        with Session() as session:
+            profile = get_job_profile(jd_text, session)
+            candidates = shortlist_filter(session, profile, RANKING_SHORTLIST_SIZE, in_pool)
+            ensure_features(session, profile, candidates)
+            ranked_page(session, profile, weights, candidates, limit=50)
+
+    doc_cache.clear()
+    results["ranking.end_to_end.cold"] = time_each(rank, job_descriptions)  # Extracts profiles, scores the shortlist
+    results["ranking.end_to_end.warm"] = time_each(rank, job_descriptions)  # Profiles and features are stored
+
+    lowered = [skill.lower() for skill in skills]
+    pool = [Candidate(f"resume_{i}.txt", ','.join(rng.sample(lowered, rng.randint(0, 15))), rng.randint(0, 20))
+            for i in range(args.pool)]
+    profile = get_job_profile(job_descriptions[0])
+    start = time.perf_counter()
+    rank_batch(pool, profile)
+    elapsed = time.perf_counter() - start
+    results[f"ranking.rank_batch.{args.pool}"] = summarize([elapsed / args.pool] * args.pool, elapsed)
+
+
+def run(args):
+    import config
+    db_dir = tempfile.mkdtemp(prefix="bench_suite_")
+    config.DATABASE_URL = f"sqlite:///{os.path.join(db_dir, 'bench.db')}"  # Must precede the models import
+    logging.disable(logging.WARNING)
+
+    from resume_parser import parser
+    from models import init_db
+    import metrics
+
+    init_db()
+
+    skills = parser.SKILL_LIST
+    corpora = {file_type: synthetic_files(skills, args.docs, file_type, args.words, args.skills, args.seed)
+               for file_type in args.types}
+
+    results = {}
+    bench_parser(results, corpora)
+    stored = bench_ingest(results, corpora, skills, args)
+    bench_ranking(results, skills, args)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {key: value for key, value in vars(args).items()
+                       if key not in ("output", "baseline", "compare", "threshold")},
+            "stored_resumes": stored,
+        },
+        "results": results,
+        "stages": metrics.summary(),  # Per-stage timings recorded by the pipeline itself
+    }
+
+
+def compare(baseline, current, threshold, out=sys.stdout):
+    """Prints per-benchmark changes. Returns the names that regressed by more than threshold."""
+    regressions = []
+    print(f"{'benchmark':<36} {'p50 ms':>18} {'throughput':>22} {'peak MB':>9}", file=out)
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<36} {'(new)':>18}", file=out)
+            continue
+        p50_change = new["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+        throughput_change = new["throughput"] / old["throughput"] - 1 if old["throughput"] else 0.0
+        flag = ""
+        if p50_change > threshold or throughput_change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36} {old['p50_ms']:>8.3f}->{new['p50_ms']:<8.3f} "
+              f"{old['throughput']:>10.1f}->{new['throughput']:<10.1f} {new['peak_rss_mb']:>9.1f}"
+              f" ({p50_change:+.0%} p50, {throughput_change:+.0%} ops/s){flag}", file=out)
+    return regressions
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--docs", type=int, default=50, help="Resumes per file type")
+    arg_parser.add_argument("--words", type=int, default=400, help="Words per resume")
+    arg_parser.add_argument("--skills", type=int, default=12, help="Skills mentioned per resume (skill density)")
+    arg_parser.add_argument("--jd-skills", type=int, default=10, help="Skills asked for per job description")
+    arg_parser.add_argument("--queries", type=int, default=10, help="Job descriptions ranked end to end")
+    arg_parser.add_argument("--pool", type=int, default=10000, help="Candidates for the in-memory rank_batch run")
+    arg_parser.add_argument("--types", nargs="+", choices=FILE_TYPES, default=list(FILE_TYPES))
+    arg_parser.add_argument("--workers", type=int, default=1, help="ingest_batch extraction processes")
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("-o", "--output", help="Write the results JSON here (default: stdout)")
+    arg_parser.add_argument("--baseline", help="Results JSON of an earlier commit to compare this run against")
+    arg_parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                            help="Compare two saved results files without running")
+    arg_parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = arg_parser.parse_args()
+
+    if args.compare:
+        return 1 if compare(load(args.compare[0]), load(args.compare[1]), args.threshold) else 0
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        out = sys.stdout if args.output else sys.stderr  # Keep stdout valid JSON
+        return 1 if compare(load(args.baseline), report, args.threshold, out) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""The candidates of one screening session, stored as content hashes in pool_resumes.
+
+The app used to keep every uploaded filename in the Streamlit session and
+filter with Resume.filename IN (...), which grows with the upload. A pool
+is just an id: its resumes are selected with a subquery on pool_resumes,
+so the SQL stays the same size however many files were uploaded, and files
+still being ingested join the pool as soon as their Resume row exists.
+"""
+import uuid
+
+from sqlalchemy import func, select
+
+from models import PoolResume, Resume, bulk_insert
+
+MEMBER_BATCH_SIZE = 500  # Hashes per IN (...) when checking existing members
+
+
+def new_pool_id():
+    return uuid.uuid4().hex
+
+
+def add_to_pool(session, pool_id, content_hashes):
+    """Adds the uploads' content hashes to the pool, skipping members it already has. Returns the number added."""
+    content_hashes = list(dict.fromkeys(content_hashes))
+    existing = set()
+    for start in range(0, len(content_hashes), MEMBER_BATCH_SIZE):
+        batch = content_hashes[start:start + MEMBER_BATCH_SIZE]
+        existing.update(content_hash for content_hash, in session.query(PoolResume.content_hash)
+                        .filter(PoolResume.pool_id == pool_id, PoolResume.content_hash.in_(batch)))
+    added = bulk_insert(session, [PoolResume(pool_id=pool_id, content_hash=content_hash)
+                                  for content_hash in content_hashes if content_hash not in existing])
+    session.commit()
+    return added
+
+
+def pool_filter(pool_id):
+    """SQL condition on Resume selecting the pool's stored resumes."""
+    return Resume.content_hash.in_(select(PoolResume.content_hash).where(PoolResume.pool_id == pool_id))
+
+
+def pool_size(session, pool_id):
+    """Number of the pool's resumes that are stored and can be ranked."""
+    return session.query(func.count(Resume.id)).filter(pool_filter(pool_id)).scalar()
@@ -0,0 +1,294 @@
+"""Headless resume screening: rank a directory of resumes against a job description.
+
+Usage:
+    python cli.py resumes/ --jd job.txt -o ranked.csv
+    python cli.py "resumes/**/*.pdf" --jd job.pdf -o ranked.parquet --workers 8 --chunk-size 200
+
+Results are written in descending score order. Each chunk of resumes is
+scored and spilled to a sorted temporary run, and the runs are merged into
+the output at the end, so memory stays bounded by the chunk size. At most
+MERGE_FAN_IN runs are open at once; more runs are first merged in passes.
+
+Heavy dependencies (spaCy, pdfminer, the ML model) are only imported once
+main() runs, so importing this module stays cheap and never pulls in
+Streamlit.
+"""
+import argparse
+import csv
+import glob
+import heapq
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections import namedtuple
+from itertools import islice
+
+from config import INGEST_CHUNK_SIZE, INGEST_MAX_WORKERS, NLP_BATCH_SIZE, NLP_N_PROCESS
+
+SUPPORTED_TYPES = {"docx", "pdf", "txt"}
+OUTPUT_FIELDS = ["rank", "filename", "path", "ranking_score", "skill_match_percentage", "experience", "skills"]
+
+Candidate = namedtuple("Candidate", ["filename", "skills", "experience"])
+MERGE_FAN_IN = 64  # Most run files open at once while merging; lowered further under a small descriptor limit
+
+
+def iter_resume_paths(source):
+    """Yields resume file paths from a directory (recursively) or a glob pattern."""
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.rsplit('.', 1)[-1].lower() in SUPPORTED_TYPES:
+                    yield os.path.join(root, name)
+    else:
+        for path in glob.iglob(source, recursive=True):
+            if os.path.isfile(path) and path.rsplit('.', 1)[-1].lower() in SUPPORTED_TYPES:
+                yield path
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _load_text(path):
+    """Process pool entry point: reads and extracts one file -> (path, text, error)."""
+    from resume_parser import parser
+    try:
+        with open(path, "rb") as f:
+            text = parser.extract_text_from_bytes(f.read(), parser.file_type_of(path))
+        if not text or not text.strip():
+            return path, None, "No text extracted"
+        return path, text, None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def read_job_description(path):
+    from resume_parser import parser
+    with open(path, "rb") as f:
+        text = parser.extract_text_from_bytes(f.read(), parser.file_type_of(path))
+    if not text:
+        raise ValueError(f"Could not extract text from job description '{path}'")
+    return text
+
+
+def score_chunks(paths, job_profile, executor=None, chunk_size=INGEST_CHUNK_SIZE,
+                 batch_size=NLP_BATCH_SIZE, n_process=NLP_N_PROCESS):
+    """Yields lists of scored result rows, one list per chunk of input paths."""
+    from resume_parser import parser
+    from sections import split_sections
+    from nlp_cache import get_nlp
+    from ranking import rank_batch
+
+    nlp = get_nlp()
+    for chunk in _chunks(paths, chunk_size):
+        extracted = list(executor.map(_load_text, chunk)) if executor else [_load_text(path) for path in chunk]
+        for path, _, error in extracted:
+            if error:
+                logging.warning(f"Skipping '{path}': {error}")
+        parsed = [(path, text) for path, text, error in extracted if error is None]
+        sections = [split_sections(text) for _, text in parsed]
+        docs = nlp.pipe((parser.section_text(text, text_sections) for (_, text), text_sections in zip(parsed, sections)),
+                        batch_size=batch_size, n_process=n_process)
+
+        candidates = []
+        for (path, text), text_sections, doc in zip(parsed, sections, docs):
+            skills = parser.skills_from_doc(doc, text)
+            candidates.append(Candidate(os.path.basename(path), ','.join(skills),
+                                        parser.experience_from_text(text, text_sections)))
+
+        ranking_scores, skill_match_percentages = rank_batch(candidates, job_profile)
+        rows = [{
+            "filename": candidate.filename,
+            "path": path,
+            "ranking_score": ranking_score,
+            "skill_match_percentage": skill_match_percentage,
+            "experience": candidate.experience,
+            "skills": candidate.skills,
+        } for (path, _), candidate, ranking_score, skill_match_percentage
+            in zip(parsed, candidates, ranking_scores.tolist(), skill_match_percentages.tolist())]
+        yield rows
+
+
+def _write_run(rows, tmp_dir):
+    """Writes one chunk, sorted by descending score, to a JSONL run file."""
+    rows.sort(key=lambda row: row["ranking_score"], reverse=True)
+    fd, path = tempfile.mkstemp(suffix=".jsonl", dir=tmp_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    return path
+
+
+def _read_run(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _merge(paths):
+    return heapq.merge(*(_read_run(path) for path in paths), key=lambda row: row["ranking_score"], reverse=True)
+
+
+def _merge_fan_in():
+    """MERGE_FAN_IN, capped at a quarter of the open-file limit so the process keeps descriptors to spare."""
+    try:
+        import resource
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError):  # No resource module on Windows
+        return MERGE_FAN_IN
+    if soft_limit == resource.RLIM_INFINITY:
+        return MERGE_FAN_IN
+    return max(2, min(MERGE_FAN_IN, soft_limit // 4))
+
+
+def _merge_runs(runs, tmp_dir, fan_in=None):
+    """Merges consecutive groups of fan_in runs into one until at most fan_in are left. Returns the remaining runs.
+
+    Groups keep the run order and heapq.merge is stable, so rows with equal
+    scores come out in the same order as with a single merge.
+    """
+    fan_in = fan_in or _merge_fan_in()
+    while len(runs) > fan_in:
+        merged = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start:start + fan_in]
+            fd, path = tempfile.mkstemp(suffix=".jsonl", dir=tmp_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for row in _merge(group):
+                    f.write(json.dumps(row) + "\n")
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+        runs = merged
+    return runs
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, row):
+        self.file.write(json.dumps(row) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Buffers rows into row groups so only one group is held in memory at a time."""
+
+    def __init__(self, path, row_group_size=INGEST_CHUNK_SIZE):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.schema = pa.schema([
+            ("rank", pa.int64()), ("filename", pa.string()), ("path", pa.string()),
+            ("ranking_score", pa.float64()), ("skill_match_percentage", pa.float64()),
+            ("experience", pa.int64()), ("skills", pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.row_group_size = row_group_size
+        self.buffer = []
+
+    def write(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.writer.write_table(self.pa.Table.from_pylist(self.buffer, schema=self.schema))
+            self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+def screen(source, jd_path, output, output_format, workers=INGEST_MAX_WORKERS, chunk_size=INGEST_CHUNK_SIZE,
+           batch_size=NLP_BATCH_SIZE, n_process=NLP_N_PROCESS):
+    """Ranks every resume under source against the job description and writes the results. Returns the row count."""
+    from jd_profile import get_job_profile
+    import model_registry
+    import ranking  # Registers the ML model with the registry
+
+    job_profile = get_job_profile(read_job_description(jd_path))
+    if not job_profile.keywords:
+        raise ValueError("No keywords could be extracted from the job description")
+
+    workers = workers or os.cpu_count() or 1
+    # Load every model once, then fork the extraction pool so its processes share them
+    executor = model_registry.process_pool(workers, freeze_gc=True) if workers > 1 else None
+    with tempfile.TemporaryDirectory(prefix="screen_runs_") as tmp_dir:
+        try:
+            runs = [_write_run(rows, tmp_dir)
+                    for rows in score_chunks(iter_resume_paths(source), job_profile, executor,
+                                             chunk_size, batch_size, n_process)
+                    if rows]
+        finally:
+            if executor:
+                executor.shutdown()
+
+        writer = WRITERS[output_format](output)
+        count = 0
+        try:
+            for count, row in enumerate(_merge(_merge_runs(runs, tmp_dir)), start=1):
+                writer.write({"rank": count, **row})
+        finally:
+            writer.close()
+    return count
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="Rank a directory of resumes against a job description.")
+    arg_parser.add_argument("resumes", help="Directory of resumes (searched recursively) or a glob pattern")
+    arg_parser.add_argument("--jd", required=True, help="Job description file (.txt, .docx, .pdf)")
+    arg_parser.add_argument("-o", "--output", required=True, help="Output file")
+    arg_parser.add_argument("--format", choices=sorted(WRITERS), help="Output format (default: from the output extension)")
+    arg_parser.add_argument("--workers", type=int, default=INGEST_MAX_WORKERS,
+                            help="Text extraction processes (default: one per CPU core)")
+    arg_parser.add_argument("--chunk-size", type=int, default=INGEST_CHUNK_SIZE, help="Resumes scored per chunk")
+    arg_parser.add_argument("--batch-size", type=int, default=NLP_BATCH_SIZE, help="nlp.pipe batch size")
+    arg_parser.add_argument("--n-process", type=int, default=NLP_N_PROCESS, help="nlp.pipe worker processes")
+    return arg_parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    output_format = args.format or os.path.splitext(args.output)[1].lower().lstrip(".")
+    if output_format not in WRITERS:
+        print(f"Cannot infer the output format from '{args.output}', use --format", file=sys.stderr)
+        return 2
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    count = screen(args.resumes, args.jd, args.output, output_format, args.workers, args.chunk_size,
+                   args.batch_size, args.n_process)
+    print(f"Wrote {count} ranked resumes to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
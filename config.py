@@ -3,10 +3,15 @@
 import os
 import urllib.parse
 
+# Embedded SQLite database, e.g. SQLITE_PATH=resume.db; runs everything without MySQL
+SQLITE_PATH = os.environ.get("SQLITE_PATH")
+
 # Heroku ClearDB database configuration
 DATABASE_URL = os.environ.get("CLEARDB_DATABASE_URL")
 
-if DATABASE_URL:
+if SQLITE_PATH:
+    DATABASE_URL = f"sqlite:///{SQLITE_PATH}"
+elif DATABASE_URL:
     # Parse the ClearDB URL
     urllib.parse.uses_netloc.append("mysql")
     url = urllib.parse.urlparse(DATABASE_URL)
@@ -25,6 +30,14 @@ else:
     DATABASE_NAME = os.environ.get("DATABASE_NAME", "resume_db")
     DATABASE_URL = f"mysql+mysqlconnector://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}/{DATABASE_NAME}"
 
+# Database engine (pool settings apply to server databases)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = 1800  # Seconds; below MySQL's wait_timeout so idle connections are never used after a server drop
+DB_POOL_PRE_PING = True  # Checks a pooled connection is alive before handing it out
+DB_BULK_BATCH_SIZE = 1000  # Rows per executemany in bulk inserts
+SQLITE_BUSY_TIMEOUT_MS = 30000  # How long a SQLite writer waits for another process's lock
+TEXT_COMPRESSION_LEVEL = 6  # Resume.text_content compression, zstd if installed (1-22) else zlib (1-9)
 
 # Other configuration settings (e.g., upload folder)
 UPLOAD_FOLDER = 'uploads'
@@ -35,4 +48,44 @@ EXPERIENCE_WEIGHT = 0
 ML_MODEL_WEIGHT = 3  # Weight for machine learning model score
 
 # File Paths
-MODEL_PATH = os.path.join("ml_model", "model.joblib")
+MODEL_DIR = "ml_model"
+MODEL_ARTIFACT_PATH = os.path.join(MODEL_DIR, "current.json")  # Versioned scoring model written by train_model.py
+MODEL_PATH = os.path.join(MODEL_DIR, "model.joblib")  # Legacy pickled model, used when no artifact exists
+
+# NLP settings
+NLP_MODEL = os.environ.get("NLP_MODEL", "en_core_web_sm")  # en_core_web_md/lg add the word vectors semantic ranking can use
+NLP_DISABLED_PIPES = ["parser"]  # Only tagging, lemmas and entities are used
+DOC_CACHE_MAX_ENTRIES = 256
+DOC_CACHE_MAX_CHARS = 5_000_000  # Bounds the memory held by cached Docs
+NLP_SECTION_MAX_CHARS = 20_000  # Characters of a resume's summary/experience/skills sections the pipeline runs on
+
+# Bulk ingestion
+INGEST_CHUNK_SIZE = 100  # Files per bulk insert
+INGEST_MAX_WORKERS = None  # Text extraction processes, None = one per CPU core
+NLP_BATCH_SIZE = 32  # nlp.pipe batch size
+NLP_N_PROCESS = 1  # nlp.pipe worker processes
+
+# Ranking
+RANKING_SHORTLIST_SIZE = 500  # Candidates scored and ranked per JD: the SQL skill prefilter's or the semantic top-k
+
+# Text extraction limits (0 disables a limit)
+PDF_MAX_PAGES = 50
+MAX_TEXT_CHARS = 200_000
+
+# Semantic ranking
+SEMANTIC_MODEL_PATH = os.environ.get("SEMANTIC_MODEL_PATH")  # Local sentence-transformers model, else NLP_MODEL's word vectors
+SEMANTIC_WEIGHT = 50  # Points for a perfect cosine similarity, blended with the weights above
+
+# Instrumentation
+DEBUG_TRACING = os.environ.get("DEBUG_TRACING", "").lower() in ("1", "true", "yes")  # Per-item debug logs, toggleable at runtime
+METRICS_PATH = os.environ.get("METRICS_PATH")  # Prometheus text file rewritten after each run, e.g. for node_exporter
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))  # Serve /metrics on this port, 0 disables the endpoint
+
+# Background ingestion queue (see worker.py)
+INGEST_USE_QUEUE = os.environ.get("INGEST_USE_QUEUE", "1").lower() in ("1", "true", "yes")  # 0 = ingest in the page
+WORKER_CONCURRENCY = None  # Extraction processes per worker, None = one per CPU core
+WORKER_POLL_SECONDS = 2.0  # Idle wait between queue polls
+JOB_MAX_ATTEMPTS = 3
+JOB_LEASE_SECONDS = 600  # A crashed worker's jobs are claimed again after this
+JOB_RETRY_BACKOFF_SECONDS = 30  # Multiplied by the attempt number
+UI_POLL_SECONDS = 2.0  # How often the page refreshes while its jobs are pending
@@ -0,0 +1,211 @@
+import os
+import time
+import logging
+
+from sqlalchemy.exc import IntegrityError
+
+from models import Session, Resume, skill_index_rows, bulk_insert
+from semantic import embed_docs, embed_texts, semantic_backend, to_bytes
+from parse_cache import file_hash, find_stored, find_parse_results, parse_result_row, remember
+from resume_parser import parser
+from sections import split_sections
+from nlp_cache import get_nlp
+import model_registry
+from metrics import inc, observe, span, timed_iter
+from config import INGEST_CHUNK_SIZE, INGEST_MAX_WORKERS, NLP_BATCH_SIZE, NLP_N_PROCESS
+
+
+def ingest_resume(session, file_content, filename, file_type):
+    """Extracts skills and experience from one file and stores it. Returns (skills, experience).
+
+    Files whose bytes were stored before are answered from the existing row
+    without extraction or insertion.
+    """
+    content_hash = file_hash(file_content)
+    stored = find_stored(session, [content_hash])
+    if content_hash in stored:
+        skills, experience, _ = stored[content_hash]
+        return skills, experience
+
+    text = parser.extract_text_from_bytes(file_content, file_type)
+    if not text:
+        return [], 0  # Unsupported file type or no text extracted
+
+    cached = find_parse_results(session, [content_hash])
+    if content_hash in cached:
+        skills, experience = cached[content_hash]
+    else:
+        skills = parser.extract_skills_nlp(text)
+        experience = parser.extract_experience_nlp(text)
+        session.merge(parse_result_row(content_hash, skills, experience))
+    embedding = None
+    if semantic_backend():  # Without an embedding model the resume is left out of semantic ranking
+        embedding = to_bytes(embed_texts([parser.section_text(text)])[0])
+    resume = Resume(filename=filename, text_content=text, skills=','.join(skills), experience=experience,
+                    content_hash=content_hash, skill_index=skill_index_rows(skills), embedding=embedding)
+    session.add(resume)
+    try:
+        with span("db_commit"):
+            session.commit()
+        inc("resume_ingested_total")
+    except IntegrityError:
+        session.rollback()  # Stored concurrently by another session
+        skills, experience, filename = find_stored(session, [content_hash])[content_hash]
+    remember(content_hash, skills, experience, filename)
+    return skills, experience
+
+
+def _ids_by_hash(session, content_hashes, batch_size=500):
+    """Returns {content_hash: resume id} of just-inserted resumes, one SELECT per batch_size hashes."""
+    ids = {}
+    for start in range(0, len(content_hashes), batch_size):
+        ids.update(session.query(Resume.content_hash, Resume.id)
+                   .filter(Resume.content_hash.in_(content_hashes[start:start + batch_size])))
+    return ids
+
+
+def _extract_job(item):
+    """Process pool entry point: (filename, bytes) -> (filename, text, error, seconds).
+
+    The extraction time is returned because metrics recorded inside a pool
+    worker stay in that worker's process.
+    """
+    filename, file_content = item
+    start = time.perf_counter()
+    try:
+        text = parser.extract_text_from_bytes(file_content, parser.file_type_of(filename))
+        if text is None:
+            return filename, None, "Unsupported file type", time.perf_counter() - start
+        if not text.strip():
+            return filename, None, "No text extracted", time.perf_counter() - start
+        return filename, text, None, time.perf_counter() - start
+    except Exception as e:
+        return filename, None, str(e), time.perf_counter() - start
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def ingest_batch(files, session_factory=Session, chunk_size=INGEST_CHUNK_SIZE, max_workers=INGEST_MAX_WORKERS,
+                 batch_size=NLP_BATCH_SIZE, n_process=NLP_N_PROCESS, progress=None, executor=None):
+    """Extracts, parses and stores many resumes at once.
+
+    files is a list of (filename, bytes). Files whose bytes are already
+    stored are answered from the database; files with a cached parse result
+    skip NLP. Text extraction for the rest fans out over a process pool, NLP
+    runs through nlp.pipe and each chunk is written with a single bulk insert.
+    progress, if given, is called as progress(done, total). A long-running
+    caller can pass its own executor to reuse one process pool across calls.
+
+    Returns one dict per file with filename, skills, experience, error and
+    stored_as (the filename of the stored row, which differs for re-uploads).
+    """
+    total = len(files)
+    results = []
+    if not files:
+        return results
+
+    nlp = get_nlp()
+    own_executor = None
+    if executor is None:
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and total > 1:
+            own_executor = executor = model_registry.process_pool(workers, ["nlp", "extractors"])
+    try:
+        for chunk in _chunks(files, chunk_size):
+            hashes = [file_hash(file_content) for _, file_content in chunk]
+            chunk_results = [{"filename": filename, "skills": [], "experience": 0, "error": None, "stored_as": None}
+                             for filename, _ in chunk]
+            try:
+                with session_factory() as session:
+                    _ingest_chunk(session, nlp, executor, chunk, hashes, chunk_results, batch_size, n_process)
+            except Exception as e:
+                logging.exception(f"Error storing a chunk of {len(chunk)} resumes: {e}")
+                for result in chunk_results:
+                    if not result["error"] and not result["stored_as"]:
+                        result["error"] = f"Database error: {e}"
+
+            results.extend(chunk_results)
+            if progress:
+                progress(len(results), total)
+    finally:
+        if own_executor:
+            own_executor.shutdown()
+    return results
+
+
+def _ingest_chunk(session, nlp, executor, chunk, hashes, chunk_results, batch_size, n_process):
+    stored = find_stored(session, hashes)
+    first_index = {}  # content hash -> first position in the chunk, for duplicates within the upload
+    to_extract = []
+    for i, content_hash in enumerate(hashes):
+        if content_hash in stored:
+            skills, experience, stored_as = stored[content_hash]
+            chunk_results[i].update(skills=skills, experience=experience, stored_as=stored_as)
+        elif content_hash not in first_index:
+            first_index[content_hash] = i
+            to_extract.append(i)
+
+    items = [chunk[i] for i in to_extract]
+    if executor:
+        extracted = list(executor.map(_extract_job, items))
+        for _, _, _, seconds in extracted:
+            observe("text_extraction", seconds)
+    else:
+        extracted = [_extract_job(item) for item in items]  # Timed by the parser's own span
+    texts = {}
+    for i, (_, text, error, _) in zip(to_extract, extracted):
+        if error:
+            chunk_results[i]["error"] = error
+        else:
+            texts[i] = text
+
+    cached = find_parse_results(session, [hashes[i] for i in texts])
+    to_parse = [i for i in texts if hashes[i] not in cached]
+    sections = {i: split_sections(texts[i]) for i in to_parse}
+    # The pipeline only runs on each resume's summary, experience and skills sections
+    docs = timed_iter("nlp_parse", nlp.pipe((parser.section_text(texts[i], sections[i]) for i in to_parse),
+                                            batch_size=batch_size, n_process=n_process))
+    parsed = {}
+    parsed_docs = []
+    for i, doc in zip(to_parse, docs):
+        parsed[hashes[i]] = (parser.skills_from_doc(doc, texts[i]), parser.experience_from_text(texts[i], sections[i]))
+        parsed_docs.append(doc)
+
+    # Document vectors for semantic ranking, from the Docs already parsed above. Cached parse results
+    # have no Doc; embed_texts only tokenizes them, so they still skip the NLP pipeline
+    vectors = {}
+    if semantic_backend():
+        vectors = dict(zip(to_parse, embed_docs(parsed_docs)))
+        reused = [i for i in texts if i not in vectors]
+        vectors.update(zip(reused, embed_texts(parser.section_text(texts[i]) for i in reused)))
+
+    rows = []
+    for i, text in texts.items():
+        skills, experience = cached.get(hashes[i]) or parsed[hashes[i]]
+        rows.append(Resume(filename=chunk_results[i]["filename"], text_content=text, skills=','.join(skills),
+                           experience=experience, content_hash=hashes[i],
+                           embedding=to_bytes(vectors[i]) if i in vectors else None))
+        chunk_results[i].update(skills=skills, experience=experience)
+
+    with span("db_commit"):
+        # Plain executemany; return_defaults would fall back to one INSERT per row without RETURNING (MySQL)
+        bulk_insert(session, rows)
+        ids = _ids_by_hash(session, [resume.content_hash for resume in rows])
+        bulk_insert(session, (skill_row for resume in rows
+                              for skill_row in skill_index_rows(resume.skills.split(','), ids[resume.content_hash])))
+        bulk_insert(session, (parse_result_row(content_hash, skills, experience)
+                              for content_hash, (skills, experience) in parsed.items()))
+        session.commit()
+    inc("resume_ingested_total", len(rows))
+    for i in texts:
+        chunk_results[i]["stored_as"] = chunk_results[i]["filename"]
+    for resume in rows:
+        remember(resume.content_hash, resume.skills.split(',') if resume.skills else [], resume.experience, resume.filename)
+
+    for i, content_hash in enumerate(hashes):
+        first = first_index.get(content_hash)
+        if first is not None and first != i:
+            chunk_results[i].update({key: chunk_results[first][key] for key in ("skills", "experience", "error", "stored_as")})
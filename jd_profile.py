@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+PROFILE_CACHE_MAX_ENTRIES = 128
+
+
+class JobProfile:
+    """A job description reduced to what ranking needs: keywords plus precomputed match structures.
+
+    Per-skill match results are memoized, so ranking the same requisition
+    again only evaluates skills it has not seen before.
+    """
+
+    def __init__(self, keywords, content_hash=None):
+        self.content_hash = content_hash
+        self.keywords = sorted(keywords)
+        self.normalized_keywords = [keyword.strip().lower() for keyword in self.keywords]
+        self.exact_keywords = frozenset(self.keywords)
+        self._skill_matches = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def skill_match(self, skill):
+        """Returns (substring match count, exact match flag) of one raw resume skill, as calculate_ranking_score counts them."""
+        match = self._skill_matches.get(skill)
+        if match is None:
+            normalized_skill = skill.strip().lower()
+            match = (sum(1 for keyword in self.normalized_keywords if keyword in normalized_skill),
+                     skill in self.exact_keywords)
+            with self._lock:
+                self._skill_matches[skill] = match
+        return match
+
+    def __repr__(self):
+        return f"<JobProfile(content_hash='{(self.content_hash or '')[:12]}', keywords={len(self.keywords)})>"
+
+
+def jd_hash(jd_text):
+    return hashlib.sha256(jd_text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def _cached(content_hash):
+    with _profiles_lock:
+        profile = _profiles.get(content_hash)
+        if profile is not None:
+            _profiles.move_to_end(content_hash)
+        return profile
+
+
+def _remember(profile):
+    with _profiles_lock:
+        _profiles[profile.content_hash] = profile
+        while len(_profiles) > PROFILE_CACHE_MAX_ENTRIES:
+            _profiles.popitem(last=False)
+
+
+def get_job_profile(jd_text, session=None):
+    """Returns the JobProfile of a job description, running keyword extraction at most once per distinct JD.
+
+    Looks in the in-process cache first, then (if a session is given) in
+    the job_profiles table, and only then runs the NLP keyword extraction,
+    storing the result in both.
+    """
+    from resume_parser import parser
+
+    content_hash = jd_hash(jd_text)
+    profile = _cached(content_hash)
+    if profile is not None:
+        return profile
+
+    if session is not None:
+        from models import JobProfileRecord  # Only needed with a database; keeps the CLI DB-free
+        record = session.get(JobProfileRecord, content_hash)
+        if record is not None and record.parser_version == parser.PARSER_VERSION:
+            profile = JobProfile(json.loads(record.keywords), content_hash)
+            _remember(profile)
+            return profile
+
+    from ranking import extract_keywords_from_job_description
+    profile = JobProfile(extract_keywords_from_job_description(jd_text), content_hash)
+    _remember(profile)
+    if session is not None:
+        from models import JobProfileRecord
+        try:
+            session.merge(JobProfileRecord(content_hash=content_hash, parser_version=parser.PARSER_VERSION,
+                                           keywords=json.dumps(profile.keywords)))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logging.warning(f"Could not store job profile {content_hash[:12]}: {e}")
+    return profile
@@ -0,0 +1,119 @@
+"""Database-backed queue of ingestion jobs, shared by the Streamlit app and worker.py.
+
+The app enqueues uploads and polls their status; one or more worker
+processes claim jobs, ingest them and mark them done. Claims are a
+conditional UPDATE, so concurrent workers never run the same job, and
+claimed jobs carry a lease: if a worker dies, its jobs become claimable
+again once the lease runs out. Completion is idempotent because ingestion
+deduplicates by content hash and a job is only finished by the worker that
+currently holds it.
+"""
+import datetime
+import logging
+import uuid
+
+from sqlalchemy import and_, func, or_, update
+
+from models import IngestJob, bulk_insert
+from parse_cache import file_hash
+from config import JOB_MAX_ATTEMPTS, JOB_LEASE_SECONDS, JOB_RETRY_BACKOFF_SECONDS
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def _now():
+    return datetime.datetime.utcnow()
+
+
+def enqueue(session, files, batch_id=None, max_attempts=JOB_MAX_ATTEMPTS):
+    """Queues [(filename, bytes)] for ingestion in one insert. Returns the batch id to poll."""
+    from resume_parser import parser
+
+    batch_id = batch_id or uuid.uuid4().hex
+    now = _now()
+    bulk_insert(session, [
+        IngestJob(batch_id=batch_id, filename=filename, file_type=parser.file_type_of(filename), content=content,
+                  content_hash=file_hash(content), status=QUEUED, attempts=0, max_attempts=max_attempts,
+                  available_at=now, created_at=now)
+        for filename, content in files
+    ])
+    session.commit()
+    return batch_id
+
+
+def _claimable(now):
+    return or_(
+        and_(IngestJob.status == QUEUED, IngestJob.available_at <= now),
+        and_(IngestJob.status == RUNNING, IngestJob.locked_until < now),  # Lease of a dead worker
+    )
+
+
+def claim(session, worker_id, limit, lease_seconds=JOB_LEASE_SECONDS):
+    """Claims up to limit jobs for worker_id, oldest first. Returns the claimed IngestJob rows.
+
+    Each claim is an UPDATE guarded by the claimable condition, so a job
+    another worker claimed in the meantime updates no row and is skipped.
+    """
+    now = _now()
+    candidates = [job_id for job_id, in session.query(IngestJob.id).filter(_claimable(now))
+                  .order_by(IngestJob.id).limit(limit)]
+    claimed = []
+    for job_id in candidates:
+        result = session.execute(
+            update(IngestJob)
+            .where(IngestJob.id == job_id, _claimable(now))
+            .values(status=RUNNING, locked_by=worker_id, attempts=IngestJob.attempts + 1,
+                    locked_until=now + datetime.timedelta(seconds=lease_seconds))
+        )
+        if result.rowcount == 1:
+            claimed.append(job_id)
+    session.commit()
+    if not claimed:
+        return []
+    return session.query(IngestJob).filter(IngestJob.id.in_(claimed)).order_by(IngestJob.id).all()
+
+
+def _owned(job_id, worker_id):
+    return and_(IngestJob.id == job_id, IngestJob.status == RUNNING, IngestJob.locked_by == worker_id)
+
+
+def complete(session, job_id, worker_id, stored_as):
+    """Marks a claimed job done and drops its bytes. Returns False if the job is no longer held by worker_id.
+
+    Like fail(), this leaves the commit to the caller, so a batch of
+    outcomes is recorded in one transaction.
+    """
+    result = session.execute(
+        update(IngestJob).where(_owned(job_id, worker_id))
+        .values(status=DONE, stored_as=stored_as, error=None, content=None, locked_by=None, locked_until=None,
+                finished_at=_now())
+    )
+    return result.rowcount == 1
+
+
+def fail(session, job, worker_id, error, permanent=False, backoff_seconds=JOB_RETRY_BACKOFF_SECONDS):
+    """Records a failed attempt: the job is queued again after a backoff, or failed for good after max_attempts."""
+    now = _now()
+    if not permanent and job.attempts < job.max_attempts:
+        values = dict(status=QUEUED, available_at=now + datetime.timedelta(seconds=backoff_seconds * job.attempts))
+    else:
+        values = dict(status=FAILED, content=None, finished_at=now)
+    result = session.execute(
+        update(IngestJob).where(_owned(job.id, worker_id))
+        .values(error=str(error)[:2000], locked_by=None, locked_until=None, **values)
+    )
+    if result.rowcount == 1 and values["status"] == FAILED:
+        logging.warning(f"Ingest job {job.id} ('{job.filename}') failed after {job.attempts} attempts: {error}")
+    return result.rowcount == 1
+
+
+def batch_status(session, batch_ids):
+    """Returns {status: count} and the finished jobs' (filename, status, stored_as, error) for the given batches."""
+    if not batch_ids:
+        return {}, []
+    counts = dict(session.query(IngestJob.status, func.count(IngestJob.id))
+                  .filter(IngestJob.batch_id.in_(batch_ids)).group_by(IngestJob.status).all())
+    finished = session.query(IngestJob.filename, IngestJob.status, IngestJob.stored_as, IngestJob.error) \
+        .filter(IngestJob.batch_id.in_(batch_ids), IngestJob.status.in_([DONE, FAILED])) \
+        .order_by(IngestJob.id).all()
+    return counts, finished
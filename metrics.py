@@ -0,0 +1,232 @@
+"""Pipeline timing spans, counters and a Prometheus text exposition.
+
+Stages are timed with ``with span("nlp_parse"):`` and aggregated into
+per-stage histograms. render_prometheus() returns the text format served by
+start_metrics_server() or written by write_prometheus().
+
+Debug tracing goes through the TRACE logger. Hot loops check
+tracing_enabled() once and skip building messages entirely when it is off,
+and set_tracing() flips it at runtime.
+"""
+import bisect
+import functools
+import http.server
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import DEBUG_TRACING
+
+TRACE = logging.getLogger("resume_screening.trace")
+
+# Upper bounds in seconds, roughly Prometheus' defaults extended down to 1 ms
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGES = ("text_extraction", "nlp_parse", "skill_extraction", "experience_extraction", "db_commit", "scoring")
+
+
+def set_tracing(enabled):
+    """Turns per-item debug tracing on or off at runtime."""
+    TRACE.setLevel(logging.DEBUG if enabled else logging.INFO)
+    if enabled and not TRACE.handlers and not logging.getLogger().isEnabledFor(logging.DEBUG):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        TRACE.addHandler(handler)
+        TRACE.propagate = False
+
+
+def tracing_enabled():
+    return TRACE.isEnabledFor(logging.DEBUG)
+
+
+set_tracing(DEBUG_TRACING)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimates a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(BUCKETS + (self.max,), self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds = {}
+        self.stage_errors = {}
+        self.counters = {}
+        self.gauges = {}  # name -> (help, callable returning a number)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self.stage_seconds.setdefault(stage, Histogram()).observe(seconds)
+
+    def error(self, stage):
+        with self._lock:
+            self.stage_errors[stage] = self.stage_errors.get(stage, 0) + 1
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def register_gauge(self, name, help_text, func):
+        self.gauges[name] = (help_text, func)
+
+    def summary(self):
+        """Per-stage rows for display: calls, total/mean/p50/p95/max seconds and errors."""
+        with self._lock:
+            stages = list(STAGES) + sorted(set(self.stage_seconds) - set(STAGES))
+            return [{
+                "Stage": stage,
+                "Calls": histogram.count,
+                "Total s": round(histogram.sum, 3),
+                "Mean ms": round(histogram.sum / histogram.count * 1000, 2) if histogram.count else 0.0,
+                "p50 ms": round(histogram.quantile(0.5) * 1000, 2),
+                "p95 ms": round(histogram.quantile(0.95) * 1000, 2),
+                "Max ms": round(histogram.max * 1000, 2),
+                "Errors": self.stage_errors.get(stage, 0),
+            } for stage, histogram in ((stage, self.stage_seconds.get(stage) or Histogram()) for stage in stages)]
+
+    def render_prometheus(self):
+        lines = [
+            "# HELP resume_pipeline_stage_seconds Time spent per pipeline stage.",
+            "# TYPE resume_pipeline_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.stage_seconds.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'resume_pipeline_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'resume_pipeline_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'resume_pipeline_stage_seconds_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'resume_pipeline_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+            lines.append("# HELP resume_pipeline_stage_errors_total Stage executions that raised.")
+            lines.append("# TYPE resume_pipeline_stage_errors_total counter")
+            for stage, errors in sorted(self.stage_errors.items()):
+                lines.append(f'resume_pipeline_stage_errors_total{{stage="{stage}"}} {errors}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {value}")
+        for name, (help_text, func) in sorted(self.gauges.items()):
+            try:
+                value = func()
+            except Exception as e:
+                logging.warning(f"Metric {name} failed: {e}")
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+observe = registry.observe
+inc = registry.inc
+register_gauge = registry.register_gauge
+render_prometheus = registry.render_prometheus
+summary = registry.summary
+
+
+@contextmanager
+def span(stage):
+    """Times the enclosed block into the stage's histogram; failures are counted as stage errors."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        registry.error(stage)
+        raise
+    finally:
+        registry.observe(stage, time.perf_counter() - start)
+
+
+def timed(stage):
+    """Decorator form of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_iter(stage, iterable):
+    """Yields from a lazy iterable (e.g. nlp.pipe), observing the time each item took to produce.
+
+    Batched producers do their work when a batch starts, so the distribution
+    is batch-shaped, but the stage's sum and count stay exact.
+    """
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        except Exception:
+            registry.error(stage)
+            raise
+        registry.observe(stage, time.perf_counter() - start)
+        yield item
+
+
+def write_prometheus(path):
+    """Writes the current metrics to a file atomically, e.g. for node_exporter's textfile collector."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the application log
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host="0.0.0.0"):
+    """Serves /metrics on a daemon thread. Safe to call on every Streamlit rerun; only the first call binds."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+            logging.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+    return _server
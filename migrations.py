@@ -0,0 +1,139 @@
+"""Brings databases created by earlier versions of models.py up to date.
+
+Usage: python migrations.py
+
+Each migration is idempotent, so the script can be run on every deploy.
+"""
+import logging
+
+from sqlalchemy import insert, select, exists, inspect, text
+
+from models import Base, Resume, ResumeSkill, ParseResult, Session, engine, init_db, skill_index_rows
+
+
+def backfill_resume_skills(session, batch_size=1000):
+    """Creates resume_skills and fills it from the comma-joined Resume.skills column. Returns the rows added."""
+    Base.metadata.create_all(engine, tables=[ResumeSkill.__table__])
+    has_index = exists().where(ResumeSkill.resume_id == Resume.id)
+    added = 0
+    last_id = 0
+    while True:
+        batch = session.execute(
+            select(Resume.id, Resume.skills)
+            .where(Resume.id > last_id, ~has_index)
+            .order_by(Resume.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            return added
+        rows = [{"resume_id": resume_id, "skill": row.skill}
+                for resume_id, skills in batch if skills
+                for row in skill_index_rows(skills.split(','))]
+        if rows:
+            session.execute(insert(ResumeSkill), rows)  # executemany
+        session.commit()
+        added += len(rows)
+        last_id = batch[-1][0]
+        logging.info(f"Backfilled skill index up to resume id {last_id} ({added} rows)")
+
+
+def add_content_hash_column(session):
+    """Adds resumes.content_hash with its unique index and creates parse_results.
+
+    Rows stored before this migration keep a NULL hash (their original bytes
+    are gone), which the unique index allows; only new uploads are deduplicated.
+    """
+    Base.metadata.create_all(engine, tables=[ParseResult.__table__])
+    inspector = inspect(engine)
+    if "content_hash" not in {column["name"] for column in inspector.get_columns("resumes")}:
+        session.execute(text("ALTER TABLE resumes ADD COLUMN content_hash VARCHAR(64)"))
+        session.commit()
+    if "ux_resumes_content_hash" not in {index["name"] for index in inspector.get_indexes("resumes")}:
+        session.execute(text("CREATE UNIQUE INDEX ux_resumes_content_hash ON resumes (content_hash)"))
+        session.commit()
+
+
+def add_embedding_column(session):
+    """Adds resumes.embedding. Existing rows stay NULL and are left out of semantic ranking until re-ingested."""
+    if "embedding" not in {column["name"] for column in inspect(engine).get_columns("resumes")}:
+        column_type = "LONGBLOB" if engine.dialect.name == "mysql" else "BLOB"
+        session.execute(text(f"ALTER TABLE resumes ADD COLUMN embedding {column_type}"))
+        session.commit()
+
+
+def compress_text_content(session, batch_size=500):
+    """Moves resumes.text_content into the compressed text_compressed column, then drops the old column.
+
+    Rows are copied in id-ordered batches, each committed on its own, so an
+    interrupted run resumes where it stopped. Run VACUUM (SQLite) or
+    OPTIMIZE TABLE (MySQL) afterwards to hand the freed space back.
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns("resumes")}
+    if "text_compressed" not in columns:
+        column_type = "MEDIUMBLOB" if engine.dialect.name == "mysql" else "BLOB"
+        session.execute(text(f"ALTER TABLE resumes ADD COLUMN text_compressed {column_type}"))
+        session.commit()
+    if "text_content" not in columns:
+        return
+    moved = 0
+    last_id = 0
+    while True:
+        batch = session.execute(
+            text("SELECT id, text_content FROM resumes WHERE id > :last_id AND text_content IS NOT NULL "
+                 "AND text_compressed IS NULL ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": batch_size},
+        ).all()
+        if not batch:
+            break
+        session.bulk_update_mappings(Resume, [{"id": resume_id, "text_content": content} for resume_id, content in batch])
+        session.commit()
+        moved += len(batch)
+        last_id = batch[-1][0]
+        logging.info(f"Compressed resume text up to resume id {last_id} ({moved} rows)")
+    try:
+        session.execute(text("ALTER TABLE resumes DROP COLUMN text_content"))
+        session.commit()
+    except Exception as e:
+        session.rollback()  # e.g. SQLite before 3.35; the copied text is cleared instead
+        logging.warning(f"Could not drop resumes.text_content ({e}), clearing it instead")
+        session.execute(text("UPDATE resumes SET text_content = NULL WHERE text_compressed IS NOT NULL"))
+        session.commit()
+
+
+def widen_resume_score_columns(session):
+    """Makes the resume_scores features DOUBLE on MySQL, where the first version created them as FLOAT.
+
+    The stored rows hold single-precision values and are deleted; they are
+    recomputed the next time each job description is ranked.
+    """
+    if engine.dialect.name != "mysql" or "resume_scores" not in inspect(engine).get_table_names():
+        return  # SQLite REAL and PostgreSQL FLOAT are already double precision
+    columns = {column["name"]: column["type"] for column in inspect(engine).get_columns("resume_scores")}
+    if all(str(columns[name]).startswith("DOUBLE") for name in ("skill_match_count", "experience", "ml_score")):
+        return
+    session.execute(text("DELETE FROM resume_scores"))
+    session.execute(text("ALTER TABLE resume_scores MODIFY skill_match_count DOUBLE NOT NULL, "
+                         "MODIFY experience DOUBLE NOT NULL, MODIFY ml_score DOUBLE NOT NULL"))
+    session.commit()
+
+
+MIGRATIONS = [
+    backfill_resume_skills,
+    add_content_hash_column,
+    add_embedding_column,
+    compress_text_content,
+    widen_resume_score_columns,
+]
+
+
+def run_all():
+    init_db()  # New tables; the migrations below update existing ones
+    with Session() as session:
+        for migration in MIGRATIONS:
+            logging.info(f"Running migration {migration.__name__}...")
+            migration(session)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_all()
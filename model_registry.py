@@ -0,0 +1,100 @@
+"""Process-wide registry of heavy models, loaded lazily and at most once per process.
+
+Modules register a loader under a name (nlp_cache registers "nlp", parser
+"skill_matcher", ranking "ranking_model", semantic "sentence_encoder") and
+fetch the instance with get(). Nothing heavy is imported or loaded until the
+first get(), so importing the app stays cheap.
+
+Long-running processes that fan out to a process pool call preload() and
+then process_pool(): the models are loaded once in the parent and the pool
+is forked after that, so every worker shares the loaded model pages
+copy-on-write instead of loading its own copy.
+"""
+import gc
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+_loaders = {}
+_instances = {}
+_load_seconds = {}
+_lock = threading.RLock()  # Reentrant: loaders may get() the models they depend on
+
+
+def register(name, loader):
+    """Registers a zero-argument loader. Re-registering replaces the loader but keeps a loaded instance."""
+    _loaders[name] = loader
+
+
+def get(name):
+    """Returns the named model, running its loader on first use."""
+    try:
+        return _instances[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _instances:
+            start = time.perf_counter()
+            _instances[name] = _loaders[name]()
+            _load_seconds[name] = time.perf_counter() - start
+            logging.info(f"Loaded '{name}' in {_load_seconds[name]:.2f}s")
+        return _instances[name]
+
+
+def put(name, instance):
+    """Installs an already built instance, e.g. a model trained in the same process."""
+    with _lock:
+        _instances[name] = instance
+
+
+def is_loaded(name):
+    return name in _instances
+
+
+def unload(name=None):
+    """Drops one loaded model (or all), so the next get() loads it again."""
+    with _lock:
+        if name is None:
+            _instances.clear()
+        else:
+            _instances.pop(name, None)
+
+
+def preload(names=None):
+    """Loads the named models (default: every registered one) now rather than on first use."""
+    for name in names or list(_loaders):
+        get(name)
+
+
+def load_times():
+    """Returns {name: seconds} of the loads done in this process."""
+    return dict(_load_seconds)
+
+
+def preload_in_background(names=None):
+    """Starts preload() on a daemon thread; a get() racing it waits for the same load instead of repeating it."""
+    thread = threading.Thread(target=preload, args=(names,), name="model-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def process_pool(max_workers, preload_names=None, freeze_gc=False):
+    """Returns a ProcessPoolExecutor whose workers are forked after preloading, sharing the parent's models.
+
+    freeze_gc moves everything allocated so far out of the garbage
+    collector's reach, so collections in the workers do not write to (and
+    thereby copy) the shared pages. Frozen objects are never collected, so
+    only dedicated processes that build their pools rarely (worker.py at
+    startup and after a crashed batch, the CLI) should set it. Fork is only used on Linux; elsewhere (macOS, Windows)
+    the platform default applies and workers load models on their own.
+    """
+    preload(preload_names)
+    if not sys.platform.startswith("linux"):
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if freeze_gc:
+        gc.collect()
+        gc.freeze()
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
@@ -1,31 +1,264 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Index
+import datetime
+import zlib
+from collections import namedtuple
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, Column, Integer, Float, String, Text, Index, ForeignKey, DateTime, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from sqlalchemy.orm import sessionmaker, relationship, deferred
+from sqlalchemy.types import TypeDecorator
+from config import (DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_BULK_BATCH_SIZE,
+                    SQLITE_BUSY_TIMEOUT_MS, TEXT_COMPRESSION_LEVEL)
 
 Base = declarative_base()
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class CompressedText(TypeDecorator):
+    """Text stored compressed: zstd when the zstandard package is installed, zlib otherwise.
+
+    Values are tagged with their codec, so rows written with either one
+    stay readable. Reads and writes take and return plain str.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        data = value.encode("utf-8", "surrogatepass")
+        if zstandard is not None:
+            return b"S" + zstandard.ZstdCompressor(level=TEXT_COMPRESSION_LEVEL).compress(data)
+        return b"Z" + zlib.compress(data, TEXT_COMPRESSION_LEVEL)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = bytes(value)
+        if value[:1] == b"S":
+            if zstandard is None:
+                raise RuntimeError("This text was compressed with zstd; install the zstandard package to read it")
+            data = zstandard.ZstdDecompressor().decompress(value[1:])
+        else:
+            data = zlib.decompress(value[1:])
+        return data.decode("utf-8", "surrogatepass")
+
+
 class Resume(Base):
     __tablename__ = 'resumes'
 
     id = Column(Integer, primary_key=True)
     filename = Column(String(255))
-    text_content = Column(Text)
+    # Compressed, and only loaded when accessed: ranking never reads the text
+    text_content = deferred(Column('text_compressed', CompressedText(length=2**24 - 1)))
     skills = Column(Text(4096))
     experience = Column(Integer)
     ranking_score = Column(Integer, default=0)
     ml_score = Column(Integer, default=0)
+    content_hash = Column(String(64))  # SHA-256 of the uploaded bytes
+    embedding = deferred(Column(LargeBinary))  # float32 document vector for semantic ranking, read by column query
 
     __table_args__ = (
         Index('ix_filename', filename),
         Index('ix_ranking_score', ranking_score),
+        Index('ux_resumes_content_hash', content_hash, unique=True),
     )
 
+    skill_index = relationship("ResumeSkill", cascade="all, delete-orphan", passive_deletes=True)
+
     def __repr__(self):
         return f"<Resume(filename='{self.filename}', ranking_score={self.ranking_score})>"
 
+
+RankingRow = namedtuple("RankingRow", ["id", "filename", "skills", "experience"])
+
+
+def ranking_query(session):
+    """Compact projection of Resume for the ranking path: id, filename, skills and experience only."""
+    return session.query(Resume.id, Resume.filename, Resume.skills, Resume.experience)
+
+
+def load_ranking_rows(session, resume_ids, batch_size=500):
+    """Returns {resume_id: RankingRow} for the given ids, without loading any text or embeddings."""
+    rows = {}
+    resume_ids = list(resume_ids)
+    for start in range(0, len(resume_ids), batch_size):
+        for row in ranking_query(session).filter(Resume.id.in_(resume_ids[start:start + batch_size])):
+            rows[row.id] = RankingRow(*row)
+    return rows
+
+
+class ResumeSkill(Base):
+    """One normalized skill of a resume, so candidates can be matched and counted in SQL."""
+    __tablename__ = 'resume_skills'
+
+    resume_id = Column(Integer, ForeignKey('resumes.id', ondelete='CASCADE'), primary_key=True)
+    skill = Column(String(255), primary_key=True)  # Stripped and lowercased
+
+    __table_args__ = (
+        Index('ix_resume_skills_skill', skill, resume_id),
+    )
+
+    def __repr__(self):
+        return f"<ResumeSkill(resume_id={self.resume_id}, skill='{self.skill}')>"
+
+
+class ParseResult(Base):
+    """Extraction output for a file's bytes, so re-uploads skip parsing. Invalidated by bumping PARSER_VERSION."""
+    __tablename__ = 'parse_results'
+
+    content_hash = Column(String(64), primary_key=True)
+    parser_version = Column(String(32), primary_key=True)
+    skills = Column(Text(4096))
+    experience = Column(Integer)
+
+    def __repr__(self):
+        return f"<ParseResult(content_hash='{self.content_hash[:12]}', parser_version='{self.parser_version}')>"
+
+
+class JobProfileRecord(Base):
+    """Extracted keywords of a job description, keyed by the hash of its text."""
+    __tablename__ = 'job_profiles'
+
+    content_hash = Column(String(64), primary_key=True)
+    parser_version = Column(String(32))
+    keywords = Column(Text)  # JSON list
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"<JobProfileRecord(content_hash='{self.content_hash[:12]}', parser_version='{self.parser_version}')>"
+
+
+class ResumeScore(Base):
+    """Ranking features of one resume against one job profile, so changing the weights only re-combines them."""
+    __tablename__ = 'resume_scores'
+
+    jd_hash = Column(String(64), primary_key=True)  # JobProfile.content_hash
+    resume_id = Column(Integer, ForeignKey('resumes.id', ondelete='CASCADE'), primary_key=True)
+    score_version = Column(String(64), nullable=False)  # Parser and model version the features were computed with
+    # Double precision: plain Float is single-precision FLOAT on MySQL, which would let the SQL ranking
+    # order differ from the in-memory one (ranking.combine_scores) for the same features
+    skill_match_count = Column(Float(precision=53), nullable=False)
+    experience = Column(Float(precision=53), nullable=False)
+    ml_score = Column(Float(precision=53), nullable=False)
+
+    __table_args__ = (
+        Index('ix_resume_scores_resume_id', resume_id),
+    )
+
+    def __repr__(self):
+        return f"<ResumeScore(jd_hash='{self.jd_hash[:12]}', resume_id={self.resume_id}, ml_score={self.ml_score})>"
+
+
+class PoolResume(Base):
+    """A file uploaded in one screening session, so a session's candidates are a join rather than a filename list."""
+    __tablename__ = 'pool_resumes'
+
+    pool_id = Column(String(36), primary_key=True)
+    content_hash = Column(String(64), primary_key=True)  # Matches Resume.content_hash once the file is stored
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PoolResume(pool_id='{self.pool_id}', content_hash='{self.content_hash[:12]}')>"
+
+
+class IngestJob(Base):
+    """An uploaded file queued for background ingestion by worker.py."""
+    __tablename__ = 'ingest_jobs'
+
+    id = Column(Integer, primary_key=True)
+    batch_id = Column(String(36), nullable=False)  # One upload from one UI session, polled together
+    filename = Column(String(255))
+    file_type = Column(String(16))
+    content = Column(LargeBinary(length=2**32 - 1))  # Upload bytes, cleared once the job is done
+    content_hash = Column(String(64))
+    status = Column(String(16), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    error = Column(Text)
+    stored_as = Column(String(255))  # Filename of the stored resume row
+    locked_by = Column(String(64))
+    locked_until = Column(DateTime)  # Lease; a running job whose lease expired is claimed again
+    available_at = Column(DateTime, default=datetime.datetime.utcnow)  # Delays retries
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index('ix_ingest_jobs_status_available', status, available_at),
+        Index('ix_ingest_jobs_batch_id', batch_id),
+    )
+
+    def __repr__(self):
+        return f"<IngestJob(id={self.id}, filename='{self.filename}', status='{self.status}')>"
+
+
+def normalize_skill(skill):
+    return skill.strip().lower()[:255]
+
+
+def skill_index_rows(skills, resume_id=None):
+    """Builds the resume_skills rows for a list of extracted skills, one per distinct normalized skill."""
+    normalized = dict.fromkeys(normalize_skill(skill) for skill in skills if skill.strip())
+    return [ResumeSkill(resume_id=resume_id, skill=skill) for skill in normalized]
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")  # Readers (the app) do not block the writer (worker.py)
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, far fewer fsyncs per commit
+    cursor.execute("PRAGMA foreign_keys=ON")  # Needed for ON DELETE CASCADE on resume_skills
+    cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+
+def create_db_engine(url=DATABASE_URL, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                     pool_recycle=DB_POOL_RECYCLE, pool_pre_ping=DB_POOL_PRE_PING, echo=False):
+    """Creates an engine with explicit pool settings; SQLite URLs get a WAL-mode embedded database.
+
+    No connection is opened until the engine is first used.
+    """
+    if url.startswith("sqlite"):
+        engine = create_engine(url, echo=echo, connect_args={"check_same_thread": False,
+                                                             "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000})
+        event.listen(engine, "connect", _configure_sqlite)
+        return engine
+    return create_engine(url, echo=echo, pool_size=pool_size, max_overflow=max_overflow,
+                         pool_recycle=pool_recycle, pool_pre_ping=pool_pre_ping)
+
+
+def init_db(bind=None):
+    """Creates missing tables. Run once at startup (the app, worker.py, migrations.py), not on import."""
+    Base.metadata.create_all(bind or engine)
+
+
+@contextmanager
+def unit_of_work(session_factory=None):
+    """Yields a session whose work is committed in one transaction on exit, or rolled back on error."""
+    session = (session_factory or Session)()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def bulk_insert(session, objects, batch_size=DB_BULK_BATCH_SIZE, return_defaults=False):
+    """Inserts mapped objects with bulk_save_objects, batch_size rows per executemany.
+
+    With return_defaults the objects get their generated primary keys,
+    which costs one round trip per row on most backends.
+    """
+    objects = list(objects)
+    for start in range(0, len(objects), batch_size):
+        session.bulk_save_objects(objects[start:start + batch_size], return_defaults=return_defaults)
+    return len(objects)
+
+
 # Database engine and session
-print(f"DATABASE_URL: {DATABASE_URL}")  # Add this line
-engine = create_engine(DATABASE_URL, echo=False)
-Base.metadata.create_all(engine)
+engine = create_db_engine()
 Session = sessionmaker(bind=engine)
@@ -0,0 +1,106 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import model_registry
+from config import NLP_MODEL, NLP_DISABLED_PIPES, DOC_CACHE_MAX_ENTRIES, DOC_CACHE_MAX_CHARS
+from metrics import register_gauge, span
+
+
+def _load_nlp():
+    import spacy  # Deferred: importing spaCy alone takes about half a second
+    nlp = spacy.load(NLP_MODEL, disable=NLP_DISABLED_PIPES)
+    logging.info(f"Loaded spaCy model '{NLP_MODEL}' with pipes: {nlp.pipe_names}")
+    return nlp
+
+
+model_registry.register("nlp", _load_nlp)
+
+
+def get_nlp():
+    """Returns the process-wide spaCy pipeline, loading it on first use."""
+    return model_registry.get("nlp")
+
+
+def content_hash(text):
+    """Returns a stable hex digest identifying a piece of text."""
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class DocCache:
+    """LRU cache of parsed spaCy Docs keyed by content hash.
+
+    Size is bounded both by entry count and by the total characters of the
+    cached texts, which is what a Doc's memory footprint grows with.
+    """
+
+    def __init__(self, max_entries=DOC_CACHE_MAX_ENTRIES, max_chars=DOC_CACHE_MAX_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._docs = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text):
+        """Returns the parsed Doc for text, running the pipeline only on a miss."""
+        key = content_hash(text)
+        with self._lock:
+            doc = self._docs.get(key)
+            if doc is not None:
+                self._docs.move_to_end(key)
+                self.hits += 1
+                return doc
+            self.misses += 1
+        nlp = get_nlp()
+        with span("nlp_parse"):
+            doc = nlp(text)
+        self.put(doc, key)
+        return doc
+
+    def put(self, doc, key=None):
+        """Stores an already parsed Doc, e.g. one produced by nlp.pipe."""
+        key = key or content_hash(doc.text)
+        size = len(doc.text)
+        if size > self.max_chars:
+            return  # Too large to cache without evicting everything else
+        with self._lock:
+            if key in self._docs:
+                self._docs.move_to_end(key)
+                return
+            self._docs[key] = doc
+            self._chars += size
+            while len(self._docs) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._docs.popitem(last=False)
+                self._chars -= len(evicted.text)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+            self._chars = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._docs),
+                "chars": self._chars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+doc_cache = DocCache()
+
+for _name in ("entries", "chars", "hits", "misses", "evictions"):
+    register_gauge(f"resume_doc_cache_{_name}", f"Parsed Doc cache {_name}.",
+                   lambda name=_name: doc_cache.stats()[name])
+
+
+def get_doc(text):
+    """Parses text once and shares the Doc between all extractors."""
+    return doc_cache.get(text)
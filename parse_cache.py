@@ -0,0 +1,63 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from models import Resume, ParseResult
+from resume_parser import parser
+
+RECENT_MAX_ENTRIES = 10_000
+
+# content hash -> (skills, experience, stored filename) for files already stored in this process.
+# Streamlit reruns the script on every interaction; this answers those reruns without a DB round trip.
+_recent = OrderedDict()
+_recent_lock = threading.Lock()
+
+
+def file_hash(file_content):
+    """Returns the SHA-256 hex digest of an uploaded file's bytes."""
+    return hashlib.sha256(file_content).hexdigest()
+
+
+def remember(content_hash, skills, experience, filename):
+    with _recent_lock:
+        _recent[content_hash] = (skills, experience, filename)
+        _recent.move_to_end(content_hash)
+        while len(_recent) > RECENT_MAX_ENTRIES:
+            _recent.popitem(last=False)
+
+
+def _split(skills):
+    return skills.split(',') if skills else []
+
+
+def find_stored(session, content_hashes):
+    """Returns {content_hash: (skills, experience, filename)} for hashes that already have a Resume row."""
+    found = {}
+    missing = []
+    with _recent_lock:
+        for content_hash in content_hashes:
+            if content_hash in _recent:
+                found[content_hash] = _recent[content_hash]
+            else:
+                missing.append(content_hash)
+    if missing:
+        rows = session.query(Resume.content_hash, Resume.skills, Resume.experience, Resume.filename) \
+            .filter(Resume.content_hash.in_(missing)).all()
+        for content_hash, skills, experience, filename in rows:
+            found[content_hash] = (_split(skills), experience, filename)
+            remember(content_hash, _split(skills), experience, filename)
+    return found
+
+
+def find_parse_results(session, content_hashes):
+    """Returns {content_hash: (skills, experience)} of cached extraction output for the current parser version."""
+    if not content_hashes:
+        return {}
+    rows = session.query(ParseResult.content_hash, ParseResult.skills, ParseResult.experience) \
+        .filter(ParseResult.parser_version == parser.PARSER_VERSION, ParseResult.content_hash.in_(list(content_hashes))).all()
+    return {content_hash: (_split(skills), experience) for content_hash, skills, experience in rows}
+
+
+def parse_result_row(content_hash, skills, experience):
+    return ParseResult(content_hash=content_hash, parser_version=parser.PARSER_VERSION,
+                       skills=','.join(skills), experience=experience)
@@ -1,113 +1,172 @@
-import docx
-import spacy
-import re
+import io
+import os
 import logging
-from pdfminer.high_level import extract_text
+from types import SimpleNamespace
+import model_registry
+from config import PDF_MAX_PAGES, MAX_TEXT_CHARS
+from skill_matcher import SkillMatcher
+from nlp_cache import get_nlp, get_doc
+from sections import split_sections, nlp_text, experience_years
+from metrics import TRACE, span, tracing_enabled
 
 # Configure logging (if not already configured elsewhere)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Load spaCy's English model
-nlp = spacy.load("en_core_web_sm")
+# Bump whenever extraction output changes, so cached parse results are recomputed
+PARSER_VERSION = "4"
 
-def extract_text_from_docx(docx_path):
-    """Extracts text from a .docx file."""
+SKILL_KEYWORDS = ["skill", "skills", "expert", "proficiency", "expertise", "knowledge", "proficient"]
+# Expanded skill list - Add more skills relevant to your domain!
+SKILL_LIST = [
+    "Python", "Java", "JavaScript", "C++", "C#", "SQL", "NoSQL", "Machine Learning", "Deep Learning",
+    "Data Analysis", "Data Mining", "Data Warehousing", "ETL", "Data Visualization", "Tableau", "Power BI",
+    "Communication", "Project Management", "Agile", "Scrum", "Leadership", "Teamwork", "Problem-solving",
+    "Analytical Skills", "Critical Thinking", "Time Management", "Cloud Computing", "AWS", "Azure", "GCP",
+    "Docker", "Kubernetes", "REST APIs", "Web Services", "Software Development", "Testing", "Debugging",
+    "Git", "Version Control", "Databases", "Algorithms", "Data Structures", "Statistical Modeling", "NLP", "Computer Vision",
+    "Linux", "Windows", "Networking", "Cybersecurity", "Frontend Development", "Backend Development", "Mobile Development",
+    "React", "Angular", "Vue.js", "Node.js", "Spring Boot", ".NET", "TensorFlow", "PyTorch", "Scikit-learn", "Streamlit", "Flask", "Django", "CSS", "HTML", "TypeScript"
+]
+
+
+def _load_extractors():
+    """Imports python-docx and pdfminer on first use; together they add noticeably to cold start."""
+    import docx
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    return SimpleNamespace(docx=docx, extract_pages=extract_pages, LTTextContainer=LTTextContainer)
+
+
+model_registry.register("extractors", _load_extractors)
+model_registry.register("skill_matcher", lambda: SkillMatcher(get_nlp(), SKILL_LIST))
+
+
+def get_skill_matcher():
+    """Compiles the skill vocabulary once; matching a resume is then a single pass over its tokens."""
+    return model_registry.get("skill_matcher")
+
+
+def _describe(source):
+    """Short label for log messages: the path, or the type of an in-memory file."""
+    return source[:50] if isinstance(source, str) else type(source).__name__
+
+
+def _limit(text, max_chars):
+    return text[:max_chars] if max_chars and len(text) > max_chars else text
+
+
+def extract_text_from_docx(source, max_chars=MAX_TEXT_CHARS):
+    """Extracts text from a .docx file given as a path or a file-like object (e.g. BytesIO)."""
     try:
-        doc = docx.Document(docx_path)
-        full_text = '\n'.join([para.text for para in doc.paragraphs])
-        logging.info(f"Successfully extracted text from DOCX: {docx_path[:50]}...")  # Log success
+        doc = model_registry.get("extractors").docx.Document(source)
+        full_text = _limit('\n'.join([para.text for para in doc.paragraphs]), max_chars)
+        TRACE.debug("Successfully extracted text from DOCX: %s...", _describe(source))
         return full_text
     except Exception as e:
-        logging.error(f"Error extracting text from DOCX {docx_path}: {e}")
+        logging.error(f"Error extracting text from DOCX {_describe(source)}: {e}")
         return None
 
-def extract_text_from_pdf(pdf_path):
-    """Extracts text from a PDF file."""
+def iter_pdf_pages(source, max_pages=PDF_MAX_PAGES, max_chars=MAX_TEXT_CHARS):
+    """Yields the text of a PDF page by page, from a path or a file-like object.
+
+    Stops after max_pages pages or once max_chars characters have been
+    produced (0/None means no limit), so a huge upload cannot stall a worker.
+    Layout analysis runs lazily, one page at a time.
+    """
+    extractors = model_registry.get("extractors")
+    produced = 0
+    for page in extractors.extract_pages(source, maxpages=max_pages or 0):
+        text = ''.join(element.get_text() for element in page if isinstance(element, extractors.LTTextContainer))
+        if max_chars and produced + len(text) >= max_chars:
+            yield text[:max_chars - produced]
+            return
+        produced += len(text)
+        yield text
+
+def extract_text_from_pdf(source, max_pages=PDF_MAX_PAGES, max_chars=MAX_TEXT_CHARS):
+    """Extracts text from a PDF file given as a path or a file-like object (e.g. BytesIO)."""
     try:
-        text = extract_text(pdf_path)
-        logging.info(f"Successfully extracted text from PDF: {pdf_path[:50]}...") # Log success
+        text = '\f'.join(iter_pdf_pages(source, max_pages, max_chars))
+        TRACE.debug("Successfully extracted text from PDF: %s...", _describe(source))
         return text
     except Exception as e:
-        logging.error(f"Error extracting text from PDF {pdf_path}: {e}")
+        logging.error(f"Error extracting text from PDF {_describe(source)}: {e}")
         return None
 
+def file_type_of(filename):
+    """Returns the lowercase extension of a filename without the dot, e.g. 'pdf'."""
+    return os.path.splitext(filename)[1].lower()[1:]
+
+def extract_text_from_bytes(file_content, file_type, max_pages=PDF_MAX_PAGES, max_chars=MAX_TEXT_CHARS):
+    """Extracts text from an uploaded file's bytes (or a file-like object) in memory, without temp files.
+
+    Returns None for unsupported types.
+    """
+    with span("text_extraction"):
+        if file_type == "txt":
+            if not isinstance(file_content, (bytes, bytearray)):
+                file_content = file_content.read()
+            return _limit(file_content.decode("utf-8"), max_chars)
+        source = io.BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
+        if file_type == "docx":
+            return extract_text_from_docx(source, max_chars)
+        elif file_type == "pdf":
+            return extract_text_from_pdf(source, max_pages, max_chars)
+        return None
+
+def section_text(text, sections=None):
+    """The part of a resume the NLP pipeline runs on: its summary, experience and skills sections, bounded in size."""
+    return nlp_text(sections if sections is not None else split_sections(text), text)
+
+
 def extract_skills_nlp(text):
-    """Extracts skills from text using spaCy NLP and keyword matching, handling spaces and commas."""
-    logging.info("Starting skill extraction (handling spaces and commas)...") # Debug log
+    """Extracts skills from text using the compiled skill matcher and spaCy entities."""
     if not text:
         logging.warning("No text provided for skill extraction.") # Debug log if no text
         return []
-
-    doc = nlp(text)
-    skills = set()
-    keywords = ["skill", "skills", "expert", "proficiency", "expertise", "knowledge", "proficient"]
-    # Expanded skill list - Add more skills relevant to your domain!
-    skill_list = [
-        "Python", "Java", "JavaScript", "C++", "C#", "SQL", "NoSQL", "Machine Learning", "Deep Learning",
-        "Data Analysis", "Data Mining", "Data Warehousing", "ETL", "Data Visualization", "Tableau", "Power BI",
-        "Communication", "Project Management", "Agile", "Scrum", "Leadership", "Teamwork", "Problem-solving",
-        "Analytical Skills", "Critical Thinking", "Time Management", "Cloud Computing", "AWS", "Azure", "GCP",
-        "Docker", "Kubernetes", "REST APIs", "Web Services", "Software Development", "Testing", "Debugging",
-        "Git", "Version Control", "Databases", "Algorithms", "Data Structures", "Statistical Modeling", "NLP", "Computer Vision",
-        "Linux", "Windows", "Networking", "Cybersecurity", "Frontend Development", "Backend Development", "Mobile Development",
-        "React", "Angular", "Vue.js", "Node.js", "Spring Boot", ".NET", "TensorFlow", "PyTorch", "Scikit-learn", "Streamlit", "Flask", "Django", "CSS", "HTML", "JavaScript", "TypeScript"
-    ]
-
-    logging.info(f"Number of tokens in processed text for skills: {len(doc)}") # Debug log token count
-
-    # Split text into potential skill phrases by commas and newlines, and then further by spaces
-    potential_skill_phrases = []
-    for phrase_delimiter in ['\n', ',']: # Split by newlines and commas first
-        phrases = text.split(phrase_delimiter)
-        for phrase in phrases:
-            potential_skill_phrases.extend(phrase.strip().split()) # Further split by spaces and strip whitespace
-
-    for phrase in potential_skill_phrases:
-        doc_phrase = nlp(phrase) # Process each potential skill phrase with spaCy
-        for token in doc_phrase:
-            logging.debug(f"Token for skill extraction: '{token.text}', POS: {token.pos_}") # Debug each token
-            if token.pos_ in ["NOUN", "ADJ"] and token.text in skill_list:
-                skills.add(token.text)
-                logging.debug(f"Skill added: '{token.text}'") # Debug log when skill is added
-
-    for ent in doc.ents:
-        logging.debug(f"Entity for skill extraction: '{ent.text}', Label: {ent.label_}") # Debug each entity
-        if ent.label_ == "ORG" and any(keyword in ent.text.lower() for keyword in keywords):
-            skills.add(ent.text)
-            logging.debug(f"Skill added from entity: '{ent.text}'") # Debug log when skill added from entity
-
-    final_skills = list(skills)
-    logging.info(f"Final extracted skills: {final_skills}") # Debug log final skills
+    return skills_from_doc(get_doc(section_text(text)), text)
+
+
+def skills_from_doc(doc, text=None):
+    """Extracts skills from an already parsed Doc.
+
+    With text (the whole resume, when doc only holds its NLP sections) the
+    vocabulary is matched over all of it, which needs only the tokenizer;
+    entities come from the parsed sections.
+    """
+    with span("skill_extraction"):
+        tracing = tracing_enabled()  # Checked once, so disabled tracing costs nothing per entity
+        # One linear pass over the tokens finds single and multi-word skills
+        matcher = get_skill_matcher()
+        skills = dict.fromkeys(matcher.match_text(text) if text is not None else matcher.match_doc(doc))
+
+        for ent in doc.ents:
+            if ent.label_ == "ORG" and any(keyword in ent.text.lower() for keyword in SKILL_KEYWORDS):
+                skills[ent.text] = None
+                if tracing:
+                    TRACE.debug("Skill added from entity: '%s'", ent.text)
+
+        final_skills = list(skills)
+    if tracing:
+        TRACE.debug("Extracted %d skills from %d tokens: %s", len(final_skills), len(doc), final_skills)
     return final_skills
 
 
 def extract_experience_nlp(text):
-    """Extracts experience (years) from text using NLP and regex."""
-    logging.info("Starting experience extraction...") # Debug log
+    """Extracts experience (years) from the date ranges in a resume's experience section."""
     if not text:
         logging.warning("No text provided for experience extraction.") # Debug log if no text
         return 0
+    return experience_from_text(text)
+
+
+def experience_from_text(text, sections=None):
+    """Years of experience from merged date ranges (overlapping jobs count once), else the largest stated "N years".
 
-    doc = nlp(text)
-    years = 0
-
-    logging.info(f"Number of entities in processed text for experience: {len(doc.ents)}") # Debug log entity count
-
-    for ent in doc.ents:
-        logging.debug(f"Entity for experience extraction: '{ent.text}', Label: {ent.label_}") # Debug each entity
-        if ent.label_ == "DATE":
-            match = re.search(r"(\d+)\s*years", ent.text, re.IGNORECASE)
-            if match:
-                years += int(match.group(1))
-                logging.debug(f"Experience found in date entity: '{ent.text}', years: {match.group(1)}") # Debug log experience from entity
-
-    matches = re.findall(r"(\d+)\+?\s*years", text, re.IGNORECASE)
-    for match in matches:
-        try:
-            years += int(match)
-            logging.debug(f"Experience found by regex: '{match}', total years: {years}") # Debug log experience from regex
-        except ValueError:
-            pass
-
-    logging.info(f"Total experience extracted: {years} years") # Debug log total experience
-    return years
\ No newline at end of file
+    Needs no NLP: the sections come from rule-based segmentation.
+    """
+    with span("experience_extraction"):
+        years = experience_years(sections if sections is not None else split_sections(text), text)
+    if tracing_enabled():
+        TRACE.debug("Total experience extracted: %d years", years)
+    return years
@@ -0,0 +1,222 @@
+import logging
+import os
+import re  # Import the regular expression module
+import numpy as np
+import model_registry
+from config import SKILL_MATCH_WEIGHT, EXPERIENCE_WEIGHT, ML_MODEL_WEIGHT, MODEL_PATH, MODEL_ARTIFACT_PATH
+from nlp_cache import get_doc
+from jd_profile import JobProfile
+from metrics import TRACE, timed, tracing_enabled
+
+
+def _load_model():
+    """Loads the versioned scoring model artifact, falling back to a legacy pickled model.joblib."""
+    from scoring_model import LinearScoringModel, load_model
+
+    if os.path.exists(MODEL_ARTIFACT_PATH):
+        try:
+            model = load_model(MODEL_ARTIFACT_PATH)
+            logging.info(f"Scoring model {model.version} loaded successfully.")
+            return model
+        except Exception as e:
+            logging.error(f"Error loading scoring model artifact: {e}")
+    import joblib  # Deferred along with the scikit-learn modules unpickling pulls in
+    try:
+        model = joblib.load(MODEL_PATH)
+        logging.info("Machine learning model loaded successfully.")
+    except Exception as e:
+        logging.error(f"Error loading machine learning model: {e}")
+        return None
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        stat = os.stat(MODEL_PATH)
+        # A linear model scores as a plain dot product, without sklearn's per-call validation
+        return LinearScoringModel.from_estimator(model, version=f"legacy-{stat.st_size}-{stat.st_mtime_ns}")
+    return model
+
+
+model_registry.register("ranking_model", _load_model)
+
+
+def get_model():
+    """Loads the trained machine learning model on first use. Returns None if it is unavailable."""
+    return model_registry.get("ranking_model")
+
+
+def model_version():
+    """Identifies the scoring model, so features scored with an older model are recomputed."""
+    model = get_model()
+    if model is None:
+        return "none"
+    version = getattr(model, "version", None)
+    if version:
+        return version
+    stat = os.stat(MODEL_PATH)  # A non-linear legacy model, identified by its file
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def extract_features(resume, job_keywords):
+    """Extracts features for the machine learning model."""
+    resume_skills = resume.skills.split(',')
+    skill_match_count = sum(1 for skill in resume_skills if skill in job_keywords)
+    experience = resume.experience
+    return [skill_match_count, experience]
+
+
+@timed("scoring")
+def calculate_ranking_score(resume, job_keywords):
+    """Calculates ranking score based on skill match, experience, and ML."""
+    resume_skills_str = resume.skills # Get the skills string from resume object
+    resume_skills = resume_skills_str.split(',') if resume_skills_str else [] # Split string to list
+    tracing = tracing_enabled()  # Checked once, so the per-pair logs below cost nothing when off
+
+    if tracing:
+        TRACE.debug("calculate_ranking_score for '%s': job keywords %s, resume skills %s",
+                    resume.filename, job_keywords, resume_skills)
+
+    skill_match_count = 0
+    matched_skills = [] # To track matched skills for debugging
+
+    for resume_skill in resume_skills:
+        for job_keyword in job_keywords:
+            # Changed matching logic to substring and case-insensitive
+            if job_keyword.strip().lower() in resume_skill.strip().lower(): # Substring and case-insensitive match
+                skill_match_count += 1
+                matched_skills.append(resume_skill) # Add to matched skills list
+                if tracing:
+                    TRACE.debug("Skill Match found: Resume Skill: '%s', Job Keyword: '%s'",
+                                resume_skill.strip().lower(), job_keyword.strip().lower())
+
+    total_job_keywords = len(job_keywords)
+    skill_match_percentage = 0  # Default to 0%
+
+    if total_job_keywords > 0:
+        skill_match_percentage = (skill_match_count / total_job_keywords) * 100
+        skill_match_percentage = round(skill_match_percentage, 1) #Round to 1 decimal place
+
+    model = get_model()
+    if model:
+        features = extract_features(resume, job_keywords)
+        try:
+            ml_score = model.predict([features])[0]
+        except Exception as e:
+            logging.warning(f"Error during model prediction: {e}")
+            ml_score = 0
+    else:
+        ml_score = 0
+
+    score = min((skill_match_count * SKILL_MATCH_WEIGHT) + (resume.experience * EXPERIENCE_WEIGHT) + (ml_score * ML_MODEL_WEIGHT), 100)
+    if tracing:
+        TRACE.debug("Skill matches: %d %s (%s%%), ML score: %s, final ranking score: %s",
+                    skill_match_count, matched_skills, skill_match_percentage, ml_score, score)
+    return score, skill_match_percentage # Return both scores
+
+
+@timed("scoring")
+def compute_features(resumes, job_keywords, model=None):
+    """Computes the ranking features of a whole candidate pool at once.
+
+    Matches the per-resume logic of calculate_ranking_score: a resume x skill
+    count matrix is multiplied with per-skill match vectors (substring match
+    for the skill match count, exact match for the ML feature) and the ML
+    model scores every candidate in a single predict call.
+
+    job_keywords is a keyword list or a JobProfile, whose per-skill match
+    results are reused across calls. Returns a dict of NumPy arrays aligned
+    with resumes.
+    """
+    from scipy import sparse
+
+    vocabulary = {}
+    indices = []
+    indptr = [0]
+    experience = np.zeros(len(resumes), dtype=np.float64)
+    for row, resume in enumerate(resumes):
+        if resume.skills:
+            for skill in resume.skills.split(','):
+                indices.append(vocabulary.setdefault(skill, len(vocabulary)))
+        indptr.append(len(indices))
+        experience[row] = resume.experience or 0
+
+    skill_counts = sparse.csr_matrix((np.ones(len(indices)), indices, indptr),
+                                     shape=(len(resumes), len(vocabulary)))
+
+    # One column per feature, computed once per distinct skill rather than per resume
+    profile = job_keywords if isinstance(job_keywords, JobProfile) else JobProfile(job_keywords)
+    match_vectors = np.zeros((len(vocabulary), 2))
+    for skill, column in vocabulary.items():
+        match_vectors[column] = profile.skill_match(skill)
+
+    matches = skill_counts @ match_vectors
+    skill_match_count = matches[:, 0]
+    feature_match_count = matches[:, 1]
+
+    model = model if model is not None else get_model()
+    ml_score = np.zeros(len(resumes))
+    if model and len(resumes):
+        try:
+            if hasattr(model, "predict_features"):
+                # The artifact's schema names the columns: one dot product over the whole pool
+                ml_score = model.predict_features({"skill_match_count": feature_match_count, "experience": experience})
+            else:
+                ml_score = np.asarray(model.predict(np.column_stack([feature_match_count, experience])), dtype=np.float64)
+        except Exception as e:
+            logging.warning(f"Error during model prediction: {e}")
+
+    return {
+        "skill_match_count": skill_match_count,
+        "feature_match_count": feature_match_count,
+        "experience": experience,
+        "ml_score": ml_score,
+        "skill_match_percentage": skill_match_percentages(skill_match_count, len(profile)),
+    }
+
+
+def skill_match_percentages(skill_match_count, total_job_keywords):
+    """Rounds like calculate_ranking_score, evaluating Python's round() once per distinct count."""
+    if total_job_keywords == 0:
+        return np.zeros(len(skill_match_count))
+    distinct, inverse = np.unique(skill_match_count, return_inverse=True)
+    rounded = np.array([round((count / total_job_keywords) * 100, 1) for count in distinct.tolist()])
+    return rounded[inverse] if len(distinct) else np.zeros(0)
+
+
+def combine_scores(features, skill_weight=SKILL_MATCH_WEIGHT, experience_weight=EXPERIENCE_WEIGHT,
+                   ml_weight=ML_MODEL_WEIGHT, semantic_weight=0):
+    """Applies the ranking weights to precomputed features, capped at 100 like calculate_ranking_score.
+
+    With a semantic_weight, features must also hold "semantic_similarity"
+    (cosine similarity to the JD); negative similarities add nothing.
+    """
+    scores = (features["skill_match_count"] * skill_weight + features["experience"] * experience_weight
+              + features["ml_score"] * ml_weight)
+    if semantic_weight:
+        scores = scores + np.clip(features["semantic_similarity"], 0, 1) * semantic_weight
+    return np.minimum(scores, 100)
+
+
+def rank_batch(resumes, job_keywords, model=None):
+    """Vectorized calculate_ranking_score. Returns (scores, skill_match_percentages) arrays."""
+    features = compute_features(resumes, job_keywords, model)
+    return combine_scores(features), features["skill_match_percentage"]
+
+
+def extract_keywords_from_job_description(jd_text):
+    """Extracts relevant keywords from the job description.
+
+    Runs the NLP pipeline; callers that rank repeatedly should go through
+    jd_profile.get_job_profile, which runs this at most once per distinct JD.
+    """
+    doc = get_doc(jd_text)  # Shared with the resume extractors, parsed at most once
+    keywords = set()
+
+    for token in doc:
+        is_pos_ok = token.pos_ in ["NOUN", "ADJ", "PROPN", "VERB"]
+        is_stop_ok = not token.is_stop
+        is_punct_ok = not token.is_punct and not token.is_currency and not token.is_digit
+        is_range_ok = not re.match(r'^\d+-\d+$', token.text) and not token.like_num
+
+        if is_pos_ok and is_stop_ok and is_punct_ok and is_range_ok:
+            keywords.add(token.lemma_.lower())
+
+    logging.info(f"Extracted {len(keywords)} keywords from the job description")
+    return list(keywords)
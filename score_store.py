@@ -0,0 +1,183 @@
+"""Persisted ranking features per (resume, job profile), so re-ranking rarely recomputes anything.
+
+The resume_scores table holds the weight-independent features of each
+resume against a JD (skill match count, experience, ML score). Ranking a
+pool loads the stored rows and computes only the resumes that have none
+yet (new uploads) or whose row was computed with another parser or model
+version. Applying the weights is then ranking.combine_scores over the
+loaded arrays, cheap enough to redo on every slider move.
+
+For pools too large to load, ensure_features() fills in the missing rows
+batch by batch and ranked_page() applies the weights in SQL: the database
+sorts and returns one page at a time, continuing after the last row of the
+previous page (keyset pagination), so neither the pool nor the result set
+is ever held in memory.
+"""
+import logging
+
+import numpy as np
+from sqlalchemy import and_, case, exists, func, or_
+from sqlalchemy.exc import IntegrityError
+
+from models import Resume, ResumeScore, Session, bulk_insert, ranking_query, unit_of_work
+from ranking import compute_features, model_version, skill_match_percentages
+from resume_parser import parser
+from metrics import inc, span
+from config import DB_BULK_BATCH_SIZE
+
+FEATURES = ("skill_match_count", "experience", "ml_score")
+LOAD_BATCH_SIZE = 500  # Resume ids per IN (...) query, below SQLite's bound parameter limit
+
+
+def score_version():
+    """Stored features are reused only while the parser and the ML model are unchanged."""
+    return f"{parser.PARSER_VERSION}:{model_version()}"
+
+
+def _load_rows(session, jd_hash, resume_ids, version):
+    rows = {}
+    for start in range(0, len(resume_ids), LOAD_BATCH_SIZE):
+        batch = resume_ids[start:start + LOAD_BATCH_SIZE]
+        for row in session.query(ResumeScore.resume_id, ResumeScore.skill_match_count, ResumeScore.experience,
+                                 ResumeScore.ml_score) \
+                .filter(ResumeScore.jd_hash == jd_hash, ResumeScore.resume_id.in_(batch),
+                        ResumeScore.score_version == version):
+            rows[row[0]] = row[1:]
+    return rows
+
+
+def _store_rows(session_factory, jd_hash, resume_ids, computed, version):
+    """Replaces the rows of resume_ids (stale versions included) with freshly computed features.
+
+    Writes in its own session, so committing does not expire the Resume
+    objects the caller is still reading.
+    """
+    try:
+        with unit_of_work(session_factory) as session:
+            for start in range(0, len(resume_ids), LOAD_BATCH_SIZE):
+                session.query(ResumeScore).filter(ResumeScore.jd_hash == jd_hash,
+                                                  ResumeScore.resume_id.in_(resume_ids[start:start + LOAD_BATCH_SIZE])) \
+                    .delete(synchronize_session=False)
+            bulk_insert(session, [ResumeScore(jd_hash=jd_hash, resume_id=resume_id, score_version=version,
+                                              skill_match_count=float(computed["skill_match_count"][row]),
+                                              experience=float(computed["experience"][row]),
+                                              ml_score=float(computed["ml_score"][row]))
+                                  for row, resume_id in enumerate(resume_ids)])
+    except IntegrityError:
+        pass  # Another process stored the same rows first; they hold the same features
+    except Exception as e:
+        logging.warning(f"Could not store ranking features for job profile {jd_hash[:12]}: {e}")
+
+
+def load_features(session, resumes, job_profile, model=None, session_factory=Session):
+    """Returns the compute_features dict of resumes against job_profile, computing only what is not stored yet.
+
+    Resumes must already have ids. session is only read from; new rows are
+    written through session_factory. A profile without a content_hash
+    (built from a bare keyword list) is computed in full and not stored.
+    """
+    if job_profile.content_hash is None or not resumes:
+        return compute_features(resumes, job_profile, model)
+
+    version = score_version()
+    with span("score_store"):
+        stored = _load_rows(session, job_profile.content_hash, [resume.id for resume in resumes], version)
+    missing = [resume for resume in resumes if resume.id not in stored]
+    inc("score_store_hits_total", len(resumes) - len(missing))
+    inc("score_store_misses_total", len(missing))
+
+    if missing:
+        computed = compute_features(missing, job_profile, model)
+        with span("score_store"):
+            _store_rows(session_factory, job_profile.content_hash, [resume.id for resume in missing], computed, version)
+        for row, resume in enumerate(missing):
+            stored[resume.id] = tuple(computed[name][row] for name in FEATURES)
+
+    values = np.array([stored[resume.id] for resume in resumes], dtype=np.float64).reshape(len(resumes), len(FEATURES))
+    features = {name: values[:, column] for column, name in enumerate(FEATURES)}
+    features["skill_match_percentage"] = skill_match_percentages(features["skill_match_count"], len(job_profile))
+    return features
+
+
+def ensure_features(session, job_profile, resume_filter=None, model=None, session_factory=Session,
+                    batch_size=DB_BULK_BATCH_SIZE):
+    """Computes and stores the features of every resume (matching resume_filter) that has no current row.
+
+    Walks the missing resumes in id order, batch_size at a time, through
+    the compact ranking projection. Returns the number of resumes scored.
+    """
+    if job_profile.content_hash is None:
+        raise ValueError("Only job profiles with a content_hash can be stored")
+    version = score_version()
+    current = exists().where(ResumeScore.resume_id == Resume.id, ResumeScore.jd_hash == job_profile.content_hash,
+                             ResumeScore.score_version == version)
+    scored = 0
+    last_id = 0
+    while True:
+        query = ranking_query(session).filter(Resume.id > last_id, ~current)
+        if resume_filter is not None:
+            query = query.filter(resume_filter)
+        batch = query.order_by(Resume.id).limit(batch_size).all()
+        if not batch:
+            break
+        computed = compute_features(batch, job_profile, model)
+        with span("score_store"):
+            _store_rows(session_factory, job_profile.content_hash, [resume.id for resume in batch], computed, version)
+        scored += len(batch)
+        last_id = batch[-1].id
+    inc("score_store_misses_total", scored)
+    return scored
+
+
+def score_expression(skill_weight, experience_weight, ml_weight):
+    """The weighted score of a stored row as SQL, capped at 100 like ranking.combine_scores."""
+    score = (ResumeScore.skill_match_count * float(skill_weight) + ResumeScore.experience * float(experience_weight)
+             + ResumeScore.ml_score * float(ml_weight))
+    return case((score > 100, 100.0), else_=score)
+
+
+def _ranked_query(session, job_profile, resume_filter):
+    query = session.query(Resume).join(ResumeScore, ResumeScore.resume_id == Resume.id) \
+        .filter(ResumeScore.jd_hash == job_profile.content_hash, ResumeScore.score_version == score_version())
+    return query.filter(resume_filter) if resume_filter is not None else query
+
+
+def ranked_count(session, job_profile, resume_filter=None):
+    return _ranked_query(session, job_profile, resume_filter).with_entities(func.count(Resume.id)).scalar()
+
+
+def ranked_page(session, job_profile, weights, resume_filter=None, limit=50, after=None):
+    """Returns one page of candidates, best first, ranked by the stored features under weights.
+
+    weights is (skill, experience, ml). after is the (ranking_score,
+    resume_id) of the previous page's last row; the database sorts with
+    ORDER BY score LIMIT and only the page's rows are returned. Call
+    ensure_features() first, resumes without a current row are left out.
+    """
+    score = score_expression(*weights)
+    query = _ranked_query(session, job_profile, resume_filter).with_entities(
+        Resume.id, Resume.filename, Resume.skills, Resume.experience, ResumeScore.skill_match_count, score)
+    if after is not None:
+        last_score, last_id = after
+        query = query.filter(or_(score < last_score, and_(score == last_score, Resume.id > last_id)))
+    rows = query.order_by(score.desc(), Resume.id).limit(limit).all()
+    percentages = skill_match_percentages(np.array([row[4] for row in rows], dtype=np.float64), len(job_profile))
+    return [{
+        "resume_id": resume_id,
+        "filename": filename,
+        "ranking_score": float(ranking_score),
+        "skill_match_percentage": float(percentage),
+        "experience": experience,
+        "skills": skills or "",
+    } for (resume_id, filename, skills, experience, _, ranking_score), percentage in zip(rows, percentages.tolist())]
+
+
+def iter_ranked(session, job_profile, weights, resume_filter=None, page_size=DB_BULK_BATCH_SIZE):
+    """Yields every ranked candidate, best first, one keyset page in memory at a time."""
+    after = None
+    while True:
+        page = ranked_page(session, job_profile, weights, resume_filter, page_size, after)
+        yield from page
+        if len(page) < page_size:
+            return
+        after = (page[-1]["ranking_score"], page[-1]["resume_id"])
@@ -0,0 +1,90 @@
+"""Versioned linear scoring model: a small JSON artifact scored with one NumPy dot product.
+
+The artifact holds the feature schema (names in column order), the
+coefficients and intercept, and training metadata. Loading it needs
+neither scikit-learn nor unpickling, and predict() on an (n, features)
+matrix is a single matrix-vector product, so scoring a whole candidate
+pool costs about as much as scoring one resume did with sklearn's
+per-call validation.
+
+Artifacts are written as ml_model/scoring_model_<version>.json, and
+ml_model/current.json is atomically replaced with the newest one, so a
+running app or worker never reads a half-written model.
+"""
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from config import MODEL_DIR, MODEL_ARTIFACT_PATH
+
+FEATURES = ("skill_match_count", "experience")  # The schema train_model.py fits by default
+ARTIFACT_FORMAT = 1
+
+
+class LinearScoringModel:
+    """predict(X) = X @ coef + intercept, with X's columns in the order of features."""
+
+    def __init__(self, features, coef, intercept, version=None, metadata=None):
+        self.features = tuple(features)
+        self.coef = np.asarray(coef, dtype=np.float64).reshape(-1)
+        self.intercept = float(intercept)
+        if len(self.coef) != len(self.features):
+            raise ValueError(f"{len(self.coef)} coefficients for {len(self.features)} features")
+        self.metadata = dict(metadata or {})
+        self.version = version or self._fingerprint()
+
+    def _fingerprint(self):
+        payload = json.dumps([self.features, self.coef.tolist(), self.intercept]).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:12]
+
+    def predict(self, X):
+        """Scores an (n, features) matrix, or a list of feature rows, in one dot product."""
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+    def predict_features(self, columns):
+        """Scores {feature name: array} columns, so callers need not know the schema's order."""
+        missing = [name for name in self.features if name not in columns]
+        if missing:
+            raise ValueError(f"Model {self.version} needs features {missing}")
+        return self.predict(np.column_stack([columns[name] for name in self.features]))
+
+    def to_dict(self):
+        return {"format": ARTIFACT_FORMAT, "version": self.version, "features": list(self.features),
+                "coef": self.coef.tolist(), "intercept": self.intercept, "metadata": self.metadata}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"Unsupported model artifact format {data.get('format')!r}")
+        return cls(data["features"], data["coef"], data["intercept"], data["version"], data.get("metadata"))
+
+    @classmethod
+    def from_estimator(cls, estimator, features=FEATURES, version=None, metadata=None):
+        """Converts a fitted scikit-learn linear model (coef_, intercept_), e.g. a legacy model.joblib."""
+        return cls(features, np.ravel(estimator.coef_), np.ravel([estimator.intercept_])[0], version, metadata)
+
+    def __repr__(self):
+        return f"<LinearScoringModel(version='{self.version}', features={list(self.features)})>"
+
+
+def save_model(model, directory=MODEL_DIR, current_path=MODEL_ARTIFACT_PATH):
+    """Writes the versioned artifact and points current_path at it. Returns the artifact path."""
+    os.makedirs(directory, exist_ok=True)
+    model.metadata.setdefault("created_at", datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z")
+    path = os.path.join(directory, f"scoring_model_{model.version}.json")
+    payload = json.dumps(model.to_dict(), indent=2)
+    for target in (path, current_path):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target) or ".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, target)  # Atomic, readers see the old or the new file
+    return path
+
+
+def load_model(path=MODEL_ARTIFACT_PATH):
+    with open(path, encoding="utf-8") as f:
+        return LinearScoringModel.from_dict(json.load(f))
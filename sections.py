@@ -0,0 +1,128 @@
+"""Rule-based resume sectioning and date-range experience extraction.
+
+split_sections() cuts a resume into its header (name, contact details)
+and the sections under headings like "Experience", "Skills" or
+"Education" with a single pass over the lines and no NLP. The spaCy
+pipeline then only runs on the sections it is needed for (nlp_text()),
+so its cost no longer grows with education lists, projects or
+publications.
+
+Experience is computed from the date ranges of the experience section
+("Jan 2018 - Mar 2020", "2019 – Present", "03/2017 to 12/2018"), with
+overlapping jobs merged so concurrent roles are counted once. Resumes
+without date ranges fall back to the largest stated "N years".
+"""
+import datetime
+import re
+
+from config import NLP_SECTION_MAX_CHARS
+
+HEADER = "header"  # Text before the first heading
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "career history", "relevant experience"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies", "technologies",
+               "tools", "expertise", "areas of expertise"],
+    "education": ["education", "academic background", "qualifications", "academic qualifications"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "other": ["certifications", "certificates", "awards", "achievements", "publications", "interests", "hobbies",
+              "languages", "references", "volunteering", "activities"],
+}
+NLP_SECTIONS = ("summary", "experience", "skills")  # Sections the NLP pipeline runs on
+
+_HEADINGS = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_LINE = re.compile(r"^[\s#*•\-=_|]*([A-Za-z][A-Za-z &/]{1,40}?)[\s:*\-=_|]*$")
+
+_MONTHS = {month: number for number, names in enumerate(
+    [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",), ("jun", "june"),
+     ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+     ("dec", "december")], start=1) for month in names}
+_DATE = r"(?:(?P<{p}month>[A-Za-z]{{3,9}})\.?,?\s+|(?P<{p}num>\d{{1,2}})[/.-])?(?P<{p}year>(?:19|20)\d{{2}})"
+_DATE_RANGE = re.compile(
+    _DATE.format(p="s") + r"\s*(?:-|–|—|to|until|till)\s*"
+    + r"(?:(?P<present>present|current|now|today|date)\b|" + _DATE.format(p="e") + ")",
+    re.IGNORECASE)
+_STATED_YEARS = re.compile(r"(\d{1,2})\+?\s*years", re.IGNORECASE)
+MAX_STATED_YEARS = 60
+
+
+def split_sections(text):
+    """Returns {section name: text} for a resume, with the text before the first heading under HEADER.
+
+    A heading is a short line that is nothing but a known section name
+    (optionally with a colon or decoration). Repeated sections are joined.
+    """
+    sections = {}
+    name = HEADER
+    lines = []
+    for line in text.splitlines():
+        match = _HEADING_LINE.match(line) if len(line) <= 60 else None
+        heading = _HEADINGS.get(match.group(1).strip().lower()) if match else None
+        if heading:
+            if lines:
+                sections[name] = (sections[name] + "\n" if name in sections else "") + "\n".join(lines)
+            name, lines = heading, []
+        else:
+            lines.append(line)
+    if lines:
+        sections[name] = (sections[name] + "\n" if name in sections else "") + "\n".join(lines)
+    return sections
+
+
+def nlp_text(sections, text, max_chars=NLP_SECTION_MAX_CHARS):
+    """The text the NLP pipeline runs on: the summary, experience and skills sections, at most max_chars.
+
+    A resume without recognizable headings is used as a whole, truncated
+    to max_chars, so the pipeline's cost per resume stays bounded either way.
+    """
+    relevant = "\n".join(sections[name] for name in NLP_SECTIONS if sections.get(name, "").strip())
+    return (relevant or text)[:max_chars] if max_chars else (relevant or text)
+
+
+def _month_index(month, number, year, default_month):
+    if month:
+        month = _MONTHS.get(month.lower())  # A word that is not a month ("since 2018") falls back to the default
+    elif number and 1 <= int(number) <= 12:
+        month = int(number)
+    return int(year) * 12 + (month or default_month) - 1
+
+
+def date_ranges(text, today=None):
+    """Returns [(start, end)] month indexes (year * 12 + month - 1, end inclusive) of the date ranges in text."""
+    today = today or datetime.date.today()
+    now = today.year * 12 + today.month - 1
+    ranges = []
+    for match in _DATE_RANGE.finditer(text):
+        start = _month_index(match.group("smonth"), match.group("snum"), match.group("syear"), 1)
+        if match.group("present"):
+            end = now
+        else:
+            end = _month_index(match.group("emonth"), match.group("enum"), match.group("eyear"), 1)
+        if start <= end <= now:
+            ranges.append((start, end))
+    return ranges
+
+
+def merge_ranges(ranges):
+    """Merges overlapping or adjacent (start, end) month ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def experience_years(sections, text, today=None):
+    """Whole years of experience from the merged date ranges, else the largest stated "N years"."""
+    experience = sections.get("experience") or "\n".join(
+        section for name, section in sections.items() if name != "education")  # Degrees are not work experience
+    ranges = merge_ranges(date_ranges(experience, today))
+    if ranges:
+        return sum(end - start + 1 for start, end in ranges) // 12
+    stated_in = "\n".join(sections.get(name, "") for name in ("summary", "experience")).strip() or text
+    stated = [int(years) for years in _STATED_YEARS.findall(stated_in) if int(years) <= MAX_STATED_YEARS]
+    return max(stated, default=0)
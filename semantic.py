@@ -0,0 +1,174 @@
+import logging
+import threading
+
+import numpy as np
+
+import model_registry
+from config import SEMANTIC_MODEL_PATH
+from nlp_cache import get_nlp
+
+
+def _load_encoder():
+    if not SEMANTIC_MODEL_PATH:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+        encoder = SentenceTransformer(SEMANTIC_MODEL_PATH, device="cpu")
+        logging.info(f"Loaded sentence embedding model from {SEMANTIC_MODEL_PATH}")
+        return encoder
+    except Exception as e:
+        logging.warning(f"Could not load sentence embedding model, falling back to spaCy word vectors: {e}")
+        return None
+
+
+model_registry.register("sentence_encoder", _load_encoder)
+
+
+def _get_encoder():
+    """Returns the optional local sentence-transformers model, or None to fall back to spaCy vectors."""
+    return model_registry.get("sentence_encoder")
+
+
+def semantic_backend():
+    """Returns "sentence-transformers", "spacy" or None when no embedding model is available.
+
+    spaCy only counts when NLP_MODEL ships word vectors (en_core_web_md/lg).
+    en_core_web_sm has none, and its Doc.vector falls back to the contextual
+    tensor, which spaCy itself warns is not meaningful for similarity.
+    """
+    if _get_encoder() is not None:
+        return "sentence-transformers"
+    if get_nlp().vocab.vectors.size:
+        return "spacy"
+    return None
+
+
+def _normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def embed_docs(docs):
+    """Returns L2-normalized float32 document vectors for already parsed Docs, one row per Doc."""
+    docs = list(docs)
+    if not docs:
+        return np.zeros((0, 0), dtype=np.float32)
+    encoder = _get_encoder()
+    if encoder is not None:
+        return _normalize(encoder.encode([doc.text for doc in docs]))
+    if not docs[0].vocab.vectors.size:
+        raise ValueError("No embedding model: set SEMANTIC_MODEL_PATH or an NLP_MODEL with word vectors")
+    return _normalize(np.vstack([doc.vector for doc in docs]))
+
+
+def embed_texts(texts):
+    """Returns L2-normalized float32 document vectors for raw texts.
+
+    Word vectors only need the tokenizer, so no pipeline component runs.
+    """
+    texts = list(texts)
+    encoder = _get_encoder()
+    if encoder is not None:
+        return _normalize(encoder.encode(texts))
+    return embed_docs(get_nlp().tokenizer.pipe(texts))
+
+
+def to_bytes(vector):
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def from_bytes(data):
+    return np.frombuffer(data, dtype=np.float32)
+
+
+class VectorIndex:
+    """In-process cosine similarity index over normalized document vectors.
+
+    Uses faiss (inner product on normalized vectors) when it is installed,
+    otherwise one NumPy matrix-vector product plus argpartition, which keeps
+    a top-k query to a single batched pass over the pool.
+    """
+
+    def __init__(self, ids, vectors):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.vectors = _normalize(vectors) if len(ids) else np.zeros((0, 0), dtype=np.float32)
+        self._faiss = None
+        try:
+            import faiss
+            if len(ids):
+                self._faiss = faiss.IndexFlatIP(self.vectors.shape[1])
+                self._faiss.add(self.vectors)
+        except ImportError:
+            pass
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query, k, candidate_ids=None):
+        """Returns [(id, similarity)] of the k nearest vectors, optionally restricted to candidate_ids."""
+        if not len(self.ids) or k <= 0:
+            return []
+        query = _normalize(query).reshape(-1)
+        if candidate_ids is not None:
+            mask = np.isin(self.ids, np.fromiter(candidate_ids, dtype=np.int64))
+            ids, vectors = self.ids[mask], self.vectors[mask]
+        elif self._faiss is not None:
+            similarities, positions = self._faiss.search(query.reshape(1, -1), min(k, len(self.ids)))
+            return [(int(self.ids[p]), float(s)) for p, s in zip(positions[0], similarities[0]) if p >= 0]
+        else:
+            ids, vectors = self.ids, self.vectors
+        if not len(ids):
+            return []
+        similarities = vectors @ query
+        k = min(k, len(ids))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(int(ids[p]), float(similarities[p])) for p in top]
+
+
+_index = None
+_index_signature = None
+_index_lock = threading.Lock()
+
+
+def get_index(session):
+    """Returns the vector index of all stored resumes, rebuilding it only when resumes were added or removed."""
+    from sqlalchemy import func
+    from models import Resume
+
+    global _index, _index_signature
+    signature = session.query(func.count(Resume.id), func.max(Resume.id)).filter(Resume.embedding.isnot(None)).one()
+    with _index_lock:
+        if _index is None or tuple(signature) != _index_signature:
+            rows = session.query(Resume.id, Resume.embedding).filter(Resume.embedding.isnot(None)).all()
+            vectors = [from_bytes(embedding) for _, embedding in rows]
+            width = max((len(vector) for vector in vectors), default=0)
+            rows = [(resume_id, vector) for (resume_id, _), vector in zip(rows, vectors) if len(vector) == width]
+            _index = VectorIndex([resume_id for resume_id, _ in rows], np.vstack([vector for _, vector in rows])
+                                 if rows else np.zeros((0, width)))
+            _index_signature = tuple(signature)
+            logging.info(f"Built vector index over {len(_index)} resumes")
+        return _index
+
+
+def semantic_shortlist(session, jd_text, k, resume_filter=None):
+    """Returns [(RankingRow, similarity)] for the k resumes closest to the job description."""
+    from models import Resume, load_ranking_rows
+
+    if semantic_backend() is None:
+        logging.warning("No embedding model for semantic ranking; set SEMANTIC_MODEL_PATH or use en_core_web_md/lg")
+        return []
+    index = get_index(session)
+    if not len(index):
+        return []
+    candidate_ids = None
+    if resume_filter is not None:
+        candidate_ids = [resume_id for resume_id, in session.query(Resume.id).filter(resume_filter)]
+    query = embed_texts([jd_text])[0]
+    if index.vectors.shape[1] != query.shape[0]:
+        logging.warning("Stored resume vectors do not match the embedding model; re-ingest to use semantic ranking")
+        return []
+    matches = index.search(query, k, candidate_ids)
+    resumes = load_ranking_rows(session, [resume_id for resume_id, _ in matches])
+    return [(resumes[resume_id], similarity) for resume_id, similarity in matches if resume_id in resumes]
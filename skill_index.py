@@ -0,0 +1,69 @@
+from sqlalchemy import and_, case, false, func, literal, select
+
+from models import Resume, ResumeSkill
+from jd_profile import JobProfile
+
+
+def matched_skills(session, job_profile):
+    """Returns {stored skill: match count} of the skills in resume_skills that match the job profile.
+
+    The distinct skill vocabulary is matched in Python with
+    JobProfile.skill_match, which memoizes per skill, so the database only
+    sees an equality IN (...) that ix_resume_skills_skill can serve; a
+    LIKE '%keyword%' per keyword cannot use the index.
+    """
+    matches = {}
+    for skill, in session.query(ResumeSkill.skill).distinct():
+        count, _ = job_profile.skill_match(skill)
+        if count:
+            matches[skill] = count
+    return matches
+
+
+def _skill_match_query(session, job_profile, limit, resume_filter):
+    matches = matched_skills(session, job_profile)
+    if matches:
+        # Outer join: resumes without matching (or any) skills count 0 and rank last instead of dropping out
+        match_count = func.coalesce(func.sum(case(matches, value=ResumeSkill.skill, else_=0)), 0).label('match_count')
+        query = session.query(Resume.id, match_count).outerjoin(
+            ResumeSkill, and_(ResumeSkill.resume_id == Resume.id, ResumeSkill.skill.in_(list(matches)))) \
+            .group_by(Resume.id)
+    else:
+        match_count = literal(0).label('match_count')
+        query = session.query(Resume.id, match_count)
+    if resume_filter is not None:
+        query = query.filter(resume_filter)
+    return query.order_by(match_count.desc(), Resume.id).limit(limit)
+
+
+def top_resumes_by_skill_match(session, job_profile, limit=100, resume_filter=None):
+    """Returns [(resume_id, match_count)] for the top-N resumes by matched-skill count.
+
+    job_profile is a JobProfile or a plain keyword list. The count follows
+    calculate_ranking_score: every (skill, keyword) pair where the keyword
+    is a case-insensitive substring of the skill counts once. Counting,
+    ordering and the limit all run in the database, so the resumes
+    themselves never leave it. resume_filter is an optional SQL condition
+    on Resume (e.g. candidate_pool.pool_filter(pool_id)).
+    """
+    if not isinstance(job_profile, JobProfile):
+        job_profile = JobProfile(job_profile)
+    if not len(job_profile):
+        return []
+    return [(resume_id, int(count)) for resume_id, count
+            in _skill_match_query(session, job_profile, limit, resume_filter).all()]
+
+
+def shortlist_filter(session, job_profile, limit=100, resume_filter=None):
+    """SQL condition on Resume selecting the top-N resumes of top_resumes_by_skill_match.
+
+    The shortlist stays in the database as a derived table, so it can bound
+    score_store.ensure_features and the ranked pages without loading its ids.
+    """
+    if not isinstance(job_profile, JobProfile):
+        job_profile = JobProfile(job_profile)
+    if not len(job_profile):
+        return false()
+    # Wrapped in a SELECT: MySQL rejects LIMIT directly inside IN (...)
+    shortlist = _skill_match_query(session, job_profile, limit, resume_filter).subquery()
+    return Resume.id.in_(select(shortlist.c.id))
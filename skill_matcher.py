@@ -0,0 +1,33 @@
+class SkillMatcher:
+    """Matches a fixed skill vocabulary against text in a single pass.
+
+    The vocabulary is compiled once into a spaCy PhraseMatcher keyed on the
+    lowercase token text, so multi-word skills ("Machine Learning",
+    "Spring Boot") match case-insensitively without re-running the pipeline
+    for every word of the resume.
+    """
+
+    def __init__(self, nlp, skills):
+        from spacy.matcher import PhraseMatcher
+        self.nlp = nlp
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        self.canonical = {}  # match_id -> skill name as written in the vocabulary
+        for skill in dict.fromkeys(skills):  # Drop duplicates, keep order
+            match_id = nlp.vocab.strings.add(skill.lower())
+            self.canonical[match_id] = skill
+            # make_doc only runs the tokenizer, so compiling the patterns is cheap
+            self.matcher.add(skill.lower(), [nlp.make_doc(skill)])
+
+    def __len__(self):
+        return len(self.canonical)
+
+    def match_doc(self, doc):
+        """Returns the canonical skills found in an already tokenized Doc."""
+        found = dict.fromkeys(self.canonical[match_id] for match_id, _, _ in self.matcher(doc))
+        return list(found)
+
+    def match_text(self, text):
+        """Tokenizes text (no tagger/NER) and returns the skills found in it."""
+        if not text:
+            return []
+        return self.match_doc(self.nlp.make_doc(text))
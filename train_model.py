@@ -1,40 +1,135 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error
-import joblib
+"""Trains the ranking model and writes a versioned scoring model artifact.
+
+Usage:
+    python train_model.py
+    python train_model.py --data labels.csv --chunk-size 100000
+    python train_model.py --data labels.csv --estimator sgd --epochs 5
+
+The labelled CSV (skill_match_count, experience, suitability_score) is
+read in chunks, so the label set never has to fit in memory. Every fifth
+row is held out for evaluation.
+
+- "ols" (default) accumulates the normal equations chunk by chunk and
+  solves them once: the same least-squares fit as LinearRegression on
+  the whole file.
+- "sgd" streams the chunks through SGDRegressor.partial_fit, for label
+  sets with more features or rows than a single solve should handle.
+
+Either way the result is a LinearScoringModel (see scoring_model.py):
+coefficients plus the feature schema, saved as JSON under ml_model/.
+"""
+import argparse
 import os
 import sys
 
+import numpy as np
+import pandas as pd
+
 # Add the project root to the Python path
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
 sys.path.append(PROJECT_ROOT)
-from config import MODEL_PATH
+from config import MODEL_DIR, MODEL_ARTIFACT_PATH
+from scoring_model import FEATURES, LinearScoringModel, save_model
+
+TARGET = "suitability_score"
+HOLDOUT_EVERY = 5  # Row i is held out when i % HOLDOUT_EVERY == 0
+
+
+def iter_chunks(path, chunk_size, features=FEATURES):
+    """Yields (X_train, y_train, X_test, y_test) arrays per chunk of the CSV."""
+    offset = 0
+    for data in pd.read_csv(path, usecols=list(features) + [TARGET], chunksize=chunk_size):
+        X = data[list(features)].to_numpy(dtype=np.float64)
+        y = data[TARGET].to_numpy(dtype=np.float64)
+        holdout = (np.arange(offset, offset + len(data)) % HOLDOUT_EVERY) == 0
+        offset += len(data)
+        yield X[~holdout], y[~holdout], X[holdout], y[holdout]
+
+
+def fit_ols(path, chunk_size, features=FEATURES):
+    """Least squares from X'X and X'y summed over the chunks. Returns (coef, intercept, training rows)."""
+    xtx = np.zeros((len(features) + 1, len(features) + 1))
+    xty = np.zeros(len(features) + 1)
+    rows = 0
+    for X, y, _, _ in iter_chunks(path, chunk_size, features):
+        X = np.column_stack([X, np.ones(len(X))])  # Intercept column
+        xtx += X.T @ X
+        xty += X.T @ y
+        rows += len(X)
+    if not rows:
+        raise ValueError(f"No training rows in '{path}'")
+    solution = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+    return solution[:-1], solution[-1], rows
+
+
+def fit_sgd(path, chunk_size, epochs, features=FEATURES):
+    """SGDRegressor.partial_fit over standardized chunks. Returns (coef, intercept, training rows).
+
+    A first pass collects the means and standard deviations; the scaling
+    is folded back into the coefficients, so the artifact takes raw features.
+    """
+    from sklearn.linear_model import SGDRegressor
+
+    total = np.zeros(len(features))
+    total_sq = np.zeros(len(features))
+    rows = 0
+    for X, _, _, _ in iter_chunks(path, chunk_size, features):
+        total += X.sum(axis=0)
+        total_sq += (X ** 2).sum(axis=0)
+        rows += len(X)
+    if not rows:
+        raise ValueError(f"No training rows in '{path}'")
+    mean = total / rows
+    std = np.sqrt(np.maximum(total_sq / rows - mean ** 2, 0))
+    std = np.where(std > 0, std, 1.0)
+
+    estimator = SGDRegressor(random_state=42)
+    for _ in range(epochs):
+        for X, y, _, _ in iter_chunks(path, chunk_size, features):
+            if len(X):
+                estimator.partial_fit((X - mean) / std, y)
+    coef = estimator.coef_ / std
+    return coef, float(estimator.intercept_[0] - (coef * mean).sum()), rows
+
 
-# Load the training data
-data = pd.read_csv(os.path.join(PROJECT_ROOT, "data", "train_data.csv"))
+def evaluate(model, path, chunk_size):
+    """Mean squared error on the held-out rows, streamed chunk by chunk."""
+    squared_error = 0.0
+    count = 0
+    for _, _, X, y in iter_chunks(path, chunk_size, model.features):
+        squared_error += float(((model.predict(X) - y) ** 2).sum())
+        count += len(y)
+    return squared_error / count if count else float("nan")
 
-# Prepare the features (X) and target (y)
-# Ensure that 'skill_match_count' and 'experience' columns exist in your CSV
-X = data[['skill_match_count', 'experience']]
-y = data['suitability_score']
 
-# Split the data into training and testing sets
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+def train(path, estimator="ols", chunk_size=100_000, epochs=5):
+    if estimator == "sgd":
+        coef, intercept, rows = fit_sgd(path, chunk_size, epochs)
+    else:
+        coef, intercept, rows = fit_ols(path, chunk_size)
+    model = LinearScoringModel(FEATURES, coef, intercept,
+                               metadata={"estimator": estimator, "training_rows": rows,
+                                         "data": os.path.basename(path)})
+    model.metadata["holdout_mse"] = evaluate(model, path, chunk_size)
+    return model
 
-# Create a linear regression model
-model = LinearRegression()
 
-# Train the model
-model.fit(X_train, y_train)
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Train the ranking model and save a versioned artifact.")
+    arg_parser.add_argument("--data", default=os.path.join(PROJECT_ROOT, "train_data.csv"), help="Labelled CSV")
+    arg_parser.add_argument("--estimator", choices=["ols", "sgd"], default="ols")
+    arg_parser.add_argument("--chunk-size", type=int, default=100_000, help="CSV rows read at a time")
+    arg_parser.add_argument("--epochs", type=int, default=5, help="Passes over the data with --estimator sgd")
+    arg_parser.add_argument("--output-dir", default=MODEL_DIR, help="Directory of the versioned artifacts")
+    args = arg_parser.parse_args(argv)
 
-# Make predictions on the test set
-y_pred = model.predict(X_test)
+    model = train(args.data, args.estimator, args.chunk_size, args.epochs)
+    print(f"Mean Squared Error: {model.metadata['holdout_mse']}")
+    current_path = os.path.join(args.output_dir, os.path.basename(MODEL_ARTIFACT_PATH))
+    path = save_model(model, args.output_dir, current_path)
+    print(f"Model {model.version} saved to {path}")
+    return 0
 
-# Evaluate the model
-mse = mean_squared_error(y_test, y_pred)
-print(f"Mean Squared Error: {mse}")
 
-# Save the trained model
-joblib.dump(model, MODEL_PATH)
-print(f"Model saved to {MODEL_PATH}")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Background ingestion worker: claims queued upload jobs and parses and stores them.
+
+Usage:
+    python worker.py                     # one extraction process per CPU core
+    python worker.py --concurrency 4 --batch-size 50
+    python worker.py --once              # drain the queue and exit
+
+Run as many workers as needed, on one machine or several sharing the
+database; job_queue.claim guarantees each job is run by one worker at a
+time. SIGINT/SIGTERM finish the current batch and then exit.
+
+Ingestion stages are timed in the worker, so it exports its own metrics:
+METRICS_PORT serves /metrics and METRICS_PATH is rewritten after every
+batch. Give the worker values other than the app's when both run on
+the same host, e.g. METRICS_PORT=9109 python worker.py.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import metrics
+from config import INGEST_CHUNK_SIZE, METRICS_PATH, METRICS_PORT, WORKER_CONCURRENCY, WORKER_POLL_SECONDS
+
+_stopping = False
+
+
+def _request_stop(signum, frame):
+    global _stopping
+    _stopping = True
+    logging.info(f"Received signal {signum}, stopping after the current batch")
+
+
+def process_jobs(jobs, worker_id, executor=None):
+    """Ingests a claimed batch of jobs and records each outcome. Returns (done, failed) counts."""
+    from models import unit_of_work
+    from ingest import ingest_batch
+    from job_queue import complete, fail
+
+    # Without a shared pool the worker runs with --concurrency 1; ingest_batch must not fork one per batch
+    results = ingest_batch([(job.filename, job.content) for job in jobs], executor=executor,
+                           max_workers=None if executor else 1)
+    done = failed = 0
+    with unit_of_work() as session:  # All outcomes of the batch in one commit
+        for job, result in zip(jobs, results):
+            if result["error"]:
+                # Extraction errors repeat on every attempt; only database errors are worth retrying
+                fail(session, job, worker_id, result["error"], permanent=not result["error"].startswith("Database error"))
+                failed += 1
+            elif complete(session, job.id, worker_id, result["stored_as"]):
+                done += 1
+            else:
+                logging.warning(f"Ingest job {job.id} lost its lease before completing; its result is kept")
+    return done, failed
+
+
+def _export_metrics():
+    if METRICS_PATH:
+        try:
+            metrics.write_prometheus(METRICS_PATH)
+        except OSError as e:
+            logging.warning(f"Could not write metrics to {METRICS_PATH}: {e}")
+
+
+def _start_pool(concurrency):
+    """The worker's extraction pool. Models load once in this process and the pool is forked afterwards,
+    with the garbage collector frozen, so its processes share them copy-on-write. None for one process."""
+    import model_registry
+
+    if concurrency > 1:
+        return model_registry.process_pool(concurrency, freeze_gc=True)
+    model_registry.preload()
+    return None
+
+
+def run_worker(worker_id, concurrency=WORKER_CONCURRENCY, batch_size=INGEST_CHUNK_SIZE,
+               poll_seconds=WORKER_POLL_SECONDS, once=False):
+    from models import Session, init_db, unit_of_work
+    from job_queue import claim, fail
+    import ingest  # Registers the parsing models with the registry
+
+    init_db()
+    if METRICS_PORT:
+        try:
+            metrics.start_metrics_server(METRICS_PORT)
+        except OSError as e:  # e.g. the app or another worker on this host already uses the port
+            logging.warning(f"Could not serve metrics on port {METRICS_PORT}: {e}")
+    concurrency = concurrency or os.cpu_count() or 1
+    executor = _start_pool(concurrency)
+    logging.info(f"Worker {worker_id} started with {concurrency} extraction processes")
+    try:
+        while not _stopping:
+            with Session() as session:
+                jobs = claim(session, worker_id, batch_size)
+                session.expunge_all()  # Used after the session closes
+            if not jobs:
+                if once:
+                    break
+                time.sleep(poll_seconds)
+                continue
+            start = time.perf_counter()
+            try:
+                done, failed = process_jobs(jobs, worker_id, executor)
+            except Exception as e:
+                logging.exception(f"Error processing a batch of {len(jobs)} jobs: {e}")
+                with unit_of_work() as session:
+                    for job in jobs:
+                        fail(session, job, worker_id, e)
+                if executor:
+                    executor.shutdown()  # May be broken by a crashed extraction process
+                    executor = _start_pool(concurrency)  # Same preload and frozen GC as at startup
+                _export_metrics()
+                continue
+            logging.info(f"Processed {len(jobs)} jobs in {time.perf_counter() - start:.2f}s "
+                         f"({done} done, {failed} failed)")
+            _export_metrics()
+    finally:
+        if executor:
+            executor.shutdown()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY,
+                            help="Text extraction processes (default: one per CPU core)")
+    arg_parser.add_argument("--batch-size", type=int, default=INGEST_CHUNK_SIZE, help="Jobs claimed at once")
+    arg_parser.add_argument("--poll-seconds", type=float, default=WORKER_POLL_SECONDS)
+    arg_parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    args = arg_parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    run_worker(f"{socket.gethostname()}:{os.getpid()}", args.concurrency, args.batch_size, args.poll_seconds, args.once)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())